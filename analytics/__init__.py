@@ -0,0 +1,22 @@
+"""
+Analytics engine for the Foxboro Youth Soccer Analytics Dashboard.
+Pure pandas functions with no Streamlit dependency: metrics, ranks and heat-map
+intensities (metrics), trend series (trends), team records and the drill-down
+index (teams), coach (coaches) and cohort (cohorts) analytics, and the grades,
+findings and priority actions of the program assessment (assessment). The
+dashboard caches and renders their results; the same functions can be driven
+headless (python -m analytics) or from any other process.
+"""
+
+from .assessment import (GRADE_CATEGORIES, Assessment, assess_town, category_grades, find_concerns,
+                         find_strengths, gender_balance_declining, key_trends, letter_grade, peer_average,
+                         priority_actions)
+from .coaches import (COACH_KEYS, COACH_SUM_COLUMNS, build_coach_index, coach_records, coach_retention,
+                      normalize_coach_names)
+from .cohorts import (COHORT_KEYS, COHORT_PERIOD, age_group_grades, build_cohort_index, cohort_table,
+                      survival_curves)
+from .metrics import (CUBE_KEYS, CUBE_SUM_COLUMNS, METRIC_COLUMNS, RANK_DIRECTIONS, TOWN_NAMES, build_cube,
+                      build_metrics, heatmap_intensity, metric_scores, metrics_from_cube, rank_metrics, select_cube)
+from .teams import (TEAM_INDEX_LEVELS, TEAM_TABLE_COLUMNS, age_group_key, build_team_index, drill_down, team_order,
+                    team_table)
+from .trends import TIME_SERIES_METRICS, build_time_series, build_time_series_by_town
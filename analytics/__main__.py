@@ -0,0 +1,80 @@
+"""
+Headless program report: the Dashboard tab's metrics, ranks, grades, findings
+and priority actions for one focus town and year range, as JSON, without
+Streamlit. Like the dashboard, it answers from the metrics snapshot when it is
+current and from the team data otherwise.
+
+    python -m analytics                                # Foxboro, every year
+    python -m analytics --focus HOP --years 2023 2025
+"""
+
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from data_store import ENROLLMENT_CSV, TEAMS_CSV, load_teams
+from snapshot import SNAPSHOT_PERIODS, load_snapshot
+
+from . import (TOWN_NAMES, assess_town, build_cube, build_time_series_by_town, metrics_from_cube, rank_metrics,
+               select_cube)
+
+
+def selection_results(snapshot, year_range, periods=SNAPSHOT_PERIODS, towns_list=tuple(TOWN_NAMES)):
+    """(metrics_df, years, time_series_by_town) for a selection, from the snapshot (or None) when it covers it"""
+    if snapshot is not None:
+        metrics_df = snapshot.metrics(year_range, periods, towns_list)
+        time_series = snapshot.time_series(year_range, periods, towns_list)
+        if metrics_df is not None and time_series is not None:
+            return (metrics_df,) + time_series
+
+    enrollment_df = pd.read_csv(ENROLLMENT_CSV)
+    enrollment_map = dict(zip(enrollment_df['town_code'], enrollment_df['enrollment']))
+    cube = select_cube(build_cube(load_teams(TEAMS_CSV)), range(year_range[0], year_range[1] + 1), periods)
+    metrics_df = metrics_from_cube(cube, list(towns_list), enrollment_map, TOWN_NAMES)
+    return (metrics_df,) + build_time_series_by_town(cube, list(towns_list), enrollment_map)
+
+
+def town_report(focus_town, year_range, snapshot=None):
+    """JSON-ready report of one focus town for an inclusive (first, last) year range"""
+    metrics_df, years, time_series_by_town = selection_results(snapshot, year_range)
+    ranks_df = rank_metrics(metrics_df)
+    focus_name = TOWN_NAMES[focus_town]
+    assessment = assess_town(metrics_df, ranks_df, years, time_series_by_town[focus_town], focus_town, focus_name)
+    return {
+        'focus_town': focus_town,
+        'year_range': list(year_range),
+        'metrics': metrics_df.drop(columns='Town').to_dict(orient='index'),
+        'ranks': {town: {metric: int(rank) for metric, rank in row.items()}
+                  for town, row in ranks_df.to_dict(orient='index').items()},
+        'grades': assessment.grades,
+        'gender_balance_declining': assessment.gender_balance_declining,
+        'concerns': assessment.concerns,
+        'strengths': assessment.strengths,
+        'priorities': [{'timeframe': timeframe, 'action': action} for timeframe, action in assessment.priorities],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m analytics',
+                                     description='Program assessment of one town as JSON, without Streamlit')
+    parser.add_argument('--focus', default='FOX', choices=list(TOWN_NAMES), help='Focus town code')
+    parser.add_argument('--years', nargs=2, type=int, metavar=('FIRST', 'LAST'),
+                        help='Inclusive year range (default: every year in the data)')
+    args = parser.parse_args(argv)
+
+    snapshot = load_snapshot()
+    if args.years:
+        year_range = tuple(args.years)
+    elif snapshot is not None:
+        year_range = (min(snapshot.years), max(snapshot.years))
+    else:
+        years = load_teams(TEAMS_CSV)['season_year']
+        year_range = (int(years.min()), int(years.max()))
+    print(json.dumps(town_report(args.focus, year_range, snapshot), indent=1, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Program assessment of one focus town: letter grades per category, the Key
+Findings (areas needing attention and strengths) and the priority action items.
+Everything here is a pure function of the metrics frame, the rank matrix and
+the focus town's trend series; the dashboard only renders what it returns.
+"""
+
+from typing import NamedTuple
+
+from .metrics import METRIC_COLUMNS
+
+# Graded categories (in display order) and the metrics whose ranks are averaged into each
+GRADE_CATEGORIES = {
+    'Participation & Growth': ['Participation Rate', 'Retention %', 'Growth %'],
+    'Competitive Performance': ['Win %', 'Goal Diff', 'Goals For', 'Goals Against'],
+    'Program Balance': ['Gender Balance', 'Avg Division'],
+}
+
+
+def letter_grade(avg_rank):
+    """Letter grade for an average rank (1 = best)"""
+    if avg_rank <= 1.5:
+        return "A"
+    elif avg_rank <= 2.5:
+        return "B"
+    elif avg_rank <= 4.0:
+        return "C"
+    elif avg_rank <= 5.5:
+        return "D"
+    else:
+        return "F"
+
+
+def category_grades(focus_ranks):
+    """Letter grade per GRADE_CATEGORIES category from one town's row of the rank matrix"""
+    return {category: letter_grade(focus_ranks[metrics].mean()) for category, metrics in GRADE_CATEGORIES.items()}
+
+
+def gender_balance_declining(time_series_data):
+    """True when the focus town's % girls is lower in its last year with teams than in its first"""
+    series = [val for val in time_series_data['Gender Balance']['Focus'] if val is not None]
+    return len(series) >= 2 and series[-1] < series[0]
+
+
+def peer_average(metrics_df, focus_town):
+    """Every metric averaged over the towns other than the focus town"""
+    return metrics_df.drop(focus_town)[METRIC_COLUMNS].mean()
+
+
+def find_concerns(metrics_df, ranks_df, focus_town, focus_name):
+    """Areas needing attention as {'title', 'detail'} dicts, most important first"""
+    focus_metrics = metrics_df.loc[focus_town]
+    avg_metrics = peer_average(metrics_df, focus_town)
+    focus_ranks = ranks_df.loc[focus_town]
+    win_rank = focus_ranks['Win %']
+    gd_rank = focus_ranks['Goal Diff']
+    ret_rank = focus_ranks['Retention %']
+    growth_rank = focus_ranks['Growth %']
+
+    concerns = []
+
+    # Competitive Performance Analysis
+    if focus_metrics['Win %'] < 50:
+        rank_txt = f"ranks #{win_rank} of 8 towns"
+        diff = 50 - focus_metrics['Win %']
+        concerns.append({
+            'title': '🏆 Win Percentage Below 50%',
+            'detail': f"{focus_name}'s {focus_metrics['Win %']:.1f}% win rate {rank_txt}. Teams are losing more than winning by {diff:.1f} percentage points. This suggests competitive struggles that may impact player confidence and retention."
+        })
+    elif focus_metrics['Win %'] < avg_metrics['Win %']:
+        concerns.append({
+            'title': '🏆 Win % Below Average',
+            'detail': f"At {focus_metrics['Win %']:.1f}%, {focus_name} is {avg_metrics['Win %'] - focus_metrics['Win %']:.1f}% below the league average and ranks #{win_rank} of 8. Consider reviewing coaching strategies and player development programs."
+        })
+
+    # Goal Differential Analysis
+    if focus_metrics['Goal Diff'] < -2:
+        concerns.append({
+            'title': '⚽ Significant Negative Goal Differential',
+            'detail': f"Teams are being outscored by {abs(focus_metrics['Goal Diff']):.1f} goals per season on average (rank #{gd_rank}). This indicates both offensive and defensive challenges. Focus on fundamental skills training and defensive organization."
+        })
+    elif focus_metrics['Goal Diff'] < 0:
+        concerns.append({
+            'title': '⚽ Negative Goal Differential',
+            'detail': f"Teams average {focus_metrics['Goal Diff']:+.1f} goal differential per season. While modest, addressing this could improve competitive outcomes. Review both offensive creation and defensive positioning."
+        })
+
+    # Retention Analysis
+    if focus_metrics['Retention %'] < 70:
+        concerns.append({
+            'title': '🔄 Low Spring Retention',
+            'detail': f"Only {focus_metrics['Retention %']:.1f}% of Fall teams return in Spring (rank #{ret_rank}). This suggests families may be choosing other activities or experiencing dissatisfaction. Consider surveying families about barriers to participation."
+        })
+    elif focus_metrics['Retention %'] < avg_metrics['Retention %']:
+        diff = avg_metrics['Retention %'] - focus_metrics['Retention %']
+        concerns.append({
+            'title': '🔄 Below-Average Retention',
+            'detail': f"Spring retention of {focus_metrics['Retention %']:.1f}% is {diff:.1f}% below average. Understanding why families leave between seasons could help improve program satisfaction."
+        })
+
+    # Participation Analysis
+    if focus_metrics['Participation Rate'] < avg_metrics['Participation Rate']:
+        diff = avg_metrics['Participation Rate'] - focus_metrics['Participation Rate']
+        concerns.append({
+            'title': '📈 Below-Average Participation',
+            'detail': f"At {focus_metrics['Participation Rate']:.1f} teams per 100 students, {focus_name} trails the average by {diff:.1f}. Marketing efforts and community outreach could help increase awareness and enrollment."
+        })
+
+    # Growth Analysis
+    if focus_metrics['Growth %'] < -10:
+        concerns.append({
+            'title': '📉 Significant Program Decline',
+            'detail': f"Program has shrunk by {abs(focus_metrics['Growth %']):.1f}% since 2021 (rank #{growth_rank}). This declining trend requires immediate attention. Consider focus groups with current and former families to understand root causes."
+        })
+    elif focus_metrics['Growth %'] < 0:
+        concerns.append({
+            'title': '📉 Program Decline',
+            'detail': f"Program decreased by {abs(focus_metrics['Growth %']):.1f}% from 2021-2025. Reversing this trend should be a priority. Analyze competitor programs and consider new initiatives to attract families."
+        })
+
+    return concerns
+
+
+def find_strengths(metrics_df, ranks_df, years, time_series_data, focus_town, focus_name):
+    """Strengths and positive indicators as {'title', 'detail'} dicts, most important first"""
+    focus_metrics = metrics_df.loc[focus_town]
+    avg_metrics = peer_average(metrics_df, focus_town)
+    focus_ranks = ranks_df.loc[focus_town]
+    win_rank = focus_ranks['Win %']
+    gd_rank = focus_ranks['Goal Diff']
+    part_rank = focus_ranks['Participation Rate']
+    ret_rank = focus_ranks['Retention %']
+    growth_rank = focus_ranks['Growth %']
+    declining = gender_balance_declining(time_series_data)
+
+    strengths = []
+
+    # Gender Balance Strength (with a caveat when the focus town's trend is down)
+    gender_dist = abs(focus_metrics['Gender Balance'] - 50)
+    gb_latest = time_series_data['Gender Balance']['Focus'][-1] if years else None
+    gb_avg_latest = time_series_data['Gender Balance']['Avg'][-1] if years else None
+    gb_below_avg = gb_latest is not None and gb_avg_latest is not None and gb_latest < gb_avg_latest
+    if gender_dist <= 5:
+        detail = f"With {focus_metrics['Gender Balance']:.1f}% girls overall, {focus_name} has demonstrated strong gender balance over the 5-year period."
+        if declining:
+            detail += " However, this percentage is declining over time"
+            detail += f" and fell below the league average in {years[-1]}." if gb_below_avg else "."
+            detail += " See Trends Over Time tab for the downward trajectory."
+        strengths.append({
+            'title': '⚖️ Excellent Gender Balance (Historical)' if declining else '⚖️ Excellent Gender Balance',
+            'detail': detail
+        })
+    elif gender_dist <= 10:
+        detail = f"At {focus_metrics['Gender Balance']:.1f}% girls overall, the program maintains reasonable gender diversity."
+        if declining:
+            detail += " However, this percentage is declining over time"
+            detail += " and is now below the league average." if gb_below_avg else "."
+            detail += " See Trends Over Time tab to monitor this trend."
+        strengths.append({
+            'title': '⚖️ Good Gender Balance (Declining)' if declining else '⚖️ Good Gender Balance',
+            'detail': detail
+        })
+
+    # Growth Strength
+    if focus_metrics['Growth %'] > 10:
+        strengths.append({
+            'title': '📈 Strong Program Growth',
+            'detail': f"Program grew by {focus_metrics['Growth %']:+.1f}% since 2021 (rank #{growth_rank}). This momentum indicates strong community interest and program satisfaction. Document what's working to sustain this trajectory."
+        })
+    elif focus_metrics['Growth %'] > 0:
+        strengths.append({
+            'title': '📈 Positive Growth Trend',
+            'detail': f"Program expanded by {focus_metrics['Growth %']:+.1f}% from 2021-2025. Modest but positive growth shows program stability. Build on this foundation to accelerate growth."
+        })
+
+    # Participation Strength
+    if focus_metrics['Participation Rate'] > avg_metrics['Participation Rate']:
+        diff = focus_metrics['Participation Rate'] - avg_metrics['Participation Rate']
+        strengths.append({
+            'title': '📈 Above-Average Participation',
+            'detail': f"At {focus_metrics['Participation Rate']:.1f} teams per 100 students (rank #{part_rank}), {focus_name} exceeds the average by {diff:.1f}. Strong community engagement with soccer demonstrates effective outreach and program appeal."
+        })
+
+    # Win % Strength
+    if focus_metrics['Win %'] >= 55:
+        strengths.append({
+            'title': '🏆 Strong Competitive Performance',
+            'detail': f"Teams win {focus_metrics['Win %']:.1f}% of games (rank #{win_rank}), well above break-even. Competitive success enhances player confidence and program reputation. Share coaching best practices across all teams."
+        })
+    elif focus_metrics['Win %'] >= 50:
+        strengths.append({
+            'title': '🏆 Competitive Performance',
+            'detail': f"With a {focus_metrics['Win %']:.1f}% win rate, teams are winning more than losing. Maintaining competitiveness helps retain players and attract new families."
+        })
+
+    # Retention Strength
+    if focus_metrics['Retention %'] >= 90:
+        strengths.append({
+            'title': '🔄 Excellent Retention',
+            'detail': f"With {focus_metrics['Retention %']:.1f}% Spring retention (rank #{ret_rank}), nearly all Fall teams return. This loyalty indicates high program satisfaction and strong community commitment."
+        })
+    elif focus_metrics['Retention %'] >= avg_metrics['Retention %']:
+        diff = focus_metrics['Retention %'] - avg_metrics['Retention %']
+        strengths.append({
+            'title': '🔄 Above-Average Retention',
+            'detail': f"Spring retention of {focus_metrics['Retention %']:.1f}% exceeds average by {diff:.1f}%. Good retention suggests families are satisfied with the program experience."
+        })
+
+    # Goal Differential Strength
+    if focus_metrics['Goal Diff'] > 5:
+        strengths.append({
+            'title': '⚽ Strong Offensive/Defensive Balance',
+            'detail': f"Average goal differential of {focus_metrics['Goal Diff']:+.1f} per season (rank #{gd_rank}) shows teams are both scoring well and playing solid defense. Continue current coaching approaches."
+        })
+    elif focus_metrics['Goal Diff'] > 0:
+        strengths.append({
+            'title': '⚽ Positive Goal Differential',
+            'detail': f"Teams average {focus_metrics['Goal Diff']:+.1f} goal differential, indicating balanced competitive performance. Small improvements in either offense or defense could significantly boost results."
+        })
+
+    return strengths
+
+
+def priority_actions(metrics_df, focus_town):
+    """Priority action items in time order as (timeframe, action) pairs"""
+    focus_metrics = metrics_df.loc[focus_town]
+    avg_metrics = peer_average(metrics_df, focus_town)
+
+    immediate_priorities = []
+    short_term_priorities = []
+    ongoing_priorities = []
+
+    if focus_metrics['Win %'] < 48:
+        immediate_priorities.append("Review coaching strategies and player development curriculum to address competitive performance")
+    if focus_metrics['Retention %'] < 70:
+        immediate_priorities.append("Survey families to identify retention barriers and implement targeted improvements")
+    if focus_metrics['Growth %'] < -5:
+        immediate_priorities.append("Conduct focus groups with current and former families to understand declining enrollment")
+
+    # Short-term priorities
+    short_term_priorities.append("Hire a dedicated Director of Coaching to oversee player development, coach training, and program quality standards")
+    if focus_metrics['Participation Rate'] < avg_metrics['Participation Rate'] - 0.5:
+        short_term_priorities.append("Enhance marketing efforts and community outreach to increase program awareness")
+    if abs(focus_metrics['Gender Balance'] - 50) > 15:
+        short_term_priorities.append("Develop targeted recruitment for underrepresented gender to improve balance")
+    if focus_metrics['Win %'] >= 48 and focus_metrics['Win %'] < 52:
+        short_term_priorities.append("Invest in coach education and tactical training to improve competitive outcomes")
+
+    # Ongoing priorities
+    ongoing_priorities.append("Implement regular player assessment using modern Quality of Play metrics")
+    ongoing_priorities.append("Build partnerships with schools and community organizations to reduce access barriers")
+
+    return ([('Immediate', p) for p in immediate_priorities] +
+            [('Short-term', p) for p in short_term_priorities] +
+            [('Ongoing', p) for p in ongoing_priorities])
+
+
+class Assessment(NamedTuple):
+    """Everything the Dashboard tab reports about the focus town beyond the charts"""
+    grades: dict
+    gender_balance_declining: bool
+    concerns: list
+    strengths: list
+    priorities: list
+
+
+def assess_town(metrics_df, ranks_df, years, time_series_data, focus_town, focus_name):
+    """Grades, findings and priority actions for the focus town of one selection"""
+    return Assessment(
+        grades=category_grades(ranks_df.loc[focus_town]),
+        gender_balance_declining=gender_balance_declining(time_series_data),
+        concerns=find_concerns(metrics_df, ranks_df, focus_town, focus_name),
+        strengths=find_strengths(metrics_df, ranks_df, years, time_series_data, focus_town, focus_name),
+        priorities=priority_actions(metrics_df, focus_town),
+    )
+
+
+def key_trends(time_series_data):
+    """Trend bullets per GRADE_CATEGORIES category: focus town's last year vs first year"""
+    # Participation & Growth
+    participation = []
+
+    # Participation trend (threshold: 0.5 per 100 students)
+    part_change = time_series_data['Participation Rate']['Focus'][-1] - time_series_data['Participation Rate']['Focus'][0]
+    if abs(part_change) >= 0.5:
+        if part_change > 0:
+            participation.append(f"↑ Participation up {part_change:+.1f} per 100 students")
+        else:
+            participation.append(f"↓ Participation down {part_change:.1f} per 100 students")
+
+    # Retention trend (threshold: 2%)
+    ret_change = time_series_data['Retention %']['Focus'][-1] - time_series_data['Retention %']['Focus'][0]
+    if abs(ret_change) >= 2.0:
+        if ret_change > 0:
+            participation.append(f"↑ Retention up {ret_change:+.1f}%")
+        else:
+            participation.append(f"↓ Retention down {ret_change:.1f}%")
+
+    # Growth (threshold: 3%)
+    growth = time_series_data['Growth %']['Focus'][-1]
+    if abs(growth) >= 3.0:
+        if growth > 0:
+            participation.append(f"↑ Program grew {growth:+.1f}%")
+        else:
+            participation.append(f"↓ Program shrunk {growth:.1f}%")
+
+    # Competitive Performance
+    competitive = []
+
+    # Win % trend (threshold: 2 percentage points)
+    win_change = time_series_data['Win %']['Focus'][-1] - time_series_data['Win %']['Focus'][0]
+    if abs(win_change) >= 2.0:
+        if win_change > 0:
+            competitive.append(f"↑ Win % up {win_change:+.1f} points")
+        else:
+            competitive.append(f"↓ Win % down {win_change:.1f} points")
+
+    # Goal Diff trend (threshold: 0.3)
+    gd_change = time_series_data['Goal Diff']['Focus'][-1] - time_series_data['Goal Diff']['Focus'][0]
+    if abs(gd_change) >= 0.3:
+        if gd_change > 0:
+            competitive.append(f"↑ Goal diff improved {gd_change:+.1f}")
+        else:
+            competitive.append(f"↓ Goal diff declined {gd_change:.1f}")
+
+    # Overall assessment (only if significant changes)
+    if competitive:
+        if win_change > 0 and gd_change > 0:
+            competitive.append("↑ Teams more competitive")
+        elif win_change < 0 or gd_change < 0:
+            competitive.append("↓ Competitive challenges")
+
+    # Program Balance
+    balance = []
+
+    # Gender balance trend (threshold: 3% absolute change)
+    gender_change = time_series_data['Gender Balance']['Focus'][-1] - time_series_data['Gender Balance']['Focus'][0]
+    if abs(gender_change) >= 3.0:
+        if gender_change > 0:
+            balance.append(f"↑ Gender balance improving ({gender_change:+.1f}% change)")
+        else:
+            balance.append(f"↓ Gender balance declining ({gender_change:.1f}% change)")
+
+    # Division trend (threshold: 0.2 division levels)
+    last_division = time_series_data['Avg Division']['Focus'][-1]
+    div_change = last_division - time_series_data['Avg Division']['Focus'][0]
+    if abs(div_change) >= 0.2:
+        if div_change < 0:
+            balance.append(f"↑ Higher divisions (avg {last_division:.1f})")
+        else:
+            balance.append(f"↓ Lower divisions (avg {last_division:.1f})")
+
+    return {category: bullets or ["→ Stable metrics"]
+            for category, bullets in zip(GRADE_CATEGORIES, [participation, competitive, balance])}
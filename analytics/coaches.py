@@ -0,0 +1,89 @@
+"""
+Coach analytics for the Foxboro Youth Soccer Analytics Dashboard.
+Head coach names are normalized and the team rows are aggregated once into a
+small (town, coach, year, period) index; per-coach records and per-town coach
+retention for any year range are then answered from that index instead of
+rescanning the team data once per coach.
+"""
+
+import pandas as pd
+
+from .metrics import select_cube
+
+COACH_KEYS = ['town_code', 'coach_key', 'season_year', 'season_period']
+COACH_SUM_COLUMNS = ['wins', 'losses', 'ties']
+
+
+def normalize_coach_names(names):
+    """Comparable coach keys: case, spacing, periods/commas and parenthetical notes are ignored"""
+    return (names.str.replace(r'\(.*?\)', ' ', regex=True)
+            .str.replace(r'[.,]', '', regex=True)
+            .str.split().str.join(' ')
+            .str.casefold()
+            .replace('', None))
+
+
+def build_coach_index(teams_df):
+    """Aggregate team rows into per (town, coach, year, period) records in one grouped pass.
+
+    Coaches are keyed per town: the same name in two towns is treated as two coaches.
+    Teams without a head coach are left out.
+    """
+    teams = teams_df.assign(coach_key=normalize_coach_names(teams_df['head_coach']))
+    teams = teams[teams['coach_key'].notna()]
+    grouped = teams.groupby(COACH_KEYS, observed=True)
+    index = grouped[COACH_SUM_COLUMNS].sum()
+    index['teams'] = grouped.size()
+    # Display name: the spelling this coach used in that season
+    index['coach'] = grouped['head_coach'].first()
+    return index
+
+
+def coach_records(coach_index, years, periods):
+    """One row per (town, coach) with seasons coached, teams and record over the selected seasons"""
+    cells = select_cube(coach_index, years, periods)
+    grouped = cells.groupby(level=['town_code', 'coach_key'], observed=True)
+    records = grouped[COACH_SUM_COLUMNS + ['teams']].sum()
+    records['seasons'] = grouped.size()
+    # Latest spelling of the name
+    records['coach'] = grouped['coach'].last()
+
+    # Win Percentage (ties count as half a win, as for the town metrics)
+    games = records['wins'] + records['losses'] + records['ties']
+    records['win_pct'] = ((records['wins'] + 0.5 * records['ties']) / games * 100).where(games > 0)
+    return records
+
+
+def coach_retention(coach_index, years, periods, towns_list):
+    """Per-town head coach counts and retention rates over the selected seasons.
+
+    Fall -> Spring: share of a town's Fall head coaches who also coach that Spring.
+    Year over year: share of a year's head coaches who coach in the town again the next
+    year (the last selected year has no next year and is left out).
+    """
+    cells = select_cube(coach_index, years, periods)
+    by_period = cells['teams'].unstack('season_period', fill_value=0) \
+        .reindex(columns=['Fall', 'Spring'], fill_value=0) > 0
+    coached = by_period.index
+
+    keys = coached.to_frame(index=False)
+    next_year = pd.MultiIndex.from_arrays([keys['town_code'], keys['coach_key'], keys['season_year'] + 1])
+    has_next_year = keys['season_year'] < max(years)
+    flags = pd.DataFrame({
+        'fall': by_period['Fall'].to_numpy(),
+        'fall_and_spring': (by_period['Fall'] & by_period['Spring']).to_numpy(),
+        'has_next_year': has_next_year.to_numpy(),
+        'returned': (next_year.isin(coached) & has_next_year).to_numpy(),
+    }, index=keys['town_code'])
+
+    totals = flags.groupby(level='town_code', observed=True).sum().reindex(towns_list, fill_value=0)
+    coaches = keys.groupby('town_code', observed=True)['coach_key'].nunique().reindex(towns_list, fill_value=0)
+    teams = cells['teams'].groupby(level='town_code', observed=True).sum().reindex(towns_list, fill_value=0)
+
+    return pd.DataFrame({
+        'Head Coaches': coaches.astype('int64'),
+        'Team-Seasons per Coach': (teams / coaches).where(coaches > 0),
+        'Fall→Spring Coach Retention %': (totals['fall_and_spring'] / totals['fall'] * 100).where(totals['fall'] > 0),
+        'Year-over-Year Coach Retention %':
+            (totals['returned'] / totals['has_next_year'] * 100).where(totals['has_next_year'] > 0),
+    }, index=towns_list)
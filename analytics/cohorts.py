@@ -0,0 +1,88 @@
+"""
+Cohort tracking for the Foxboro Youth Soccer Analytics Dashboard.
+Every Fall team is mapped to the birth cohort it belongs to (town, gender and
+high-school class year, from the age group and season), so a cohort can be
+followed as it moves up the grades. Survival curves per town come from one
+vectorized join of each cohort's first season against its later seasons.
+"""
+
+import numpy as np
+import pandas as pd
+
+COHORT_KEYS = ['town_code', 'gender', 'class_of']
+
+# Teams are formed for the school year in the Fall; Spring rosters are what Retention % measures
+COHORT_PERIOD = 'Fall'
+
+
+def age_group_grades(age_groups):
+    """Grades covered by each age group label ('Grade 7/8' -> 7 and 8), one row per grade.
+
+    Labels without a grade number are dropped.
+    """
+    grades = pd.Series(age_groups).str.extract(r'(\d+)(?:/(\d+))?').astype('float64')
+    grades.index = pd.Index(age_groups, name='age_group')
+    return grades.stack().dropna().astype('int64').rename('grade').reset_index(level=1, drop=True)
+
+
+def build_cohort_index(teams_df):
+    """Fall team counts per (town, gender, class year, season year) with the cohort's grade.
+
+    A Fall season_year is the start of the school year, so a Grade g team in Fall Y
+    graduates with the class of Y + 13 - g. A combined age group (Grade 7/8) is split
+    evenly between the two cohorts it holds.
+    """
+    fall = teams_df[teams_df['season_period'] == COHORT_PERIOD]
+    counts = fall.groupby(['town_code', 'gender', 'season_year', 'age_group'], observed=True).size().rename('teams')
+
+    grades = age_group_grades(counts.index.get_level_values('age_group').unique().astype(str))
+    spans = grades.groupby(level='age_group').size()
+    cells = counts.reset_index()
+    cells['age_group'] = cells['age_group'].astype(str)
+    cells = cells.merge(grades.reset_index(), on='age_group')
+    cells['teams'] = cells['teams'] / cells['age_group'].map(spans)
+    cells['class_of'] = cells['season_year'] + 13 - cells['grade']
+
+    return cells.groupby(COHORT_KEYS + ['season_year'], observed=True) \
+        .agg(grade=('grade', 'first'), teams=('teams', 'sum'))
+
+
+def survival_curves(cohort_index, years, towns_list):
+    """Share (%) of each town's cohort teams still fielded k years after the cohort's first season.
+
+    Column k pools every cohort that could be seen k years later: the season is in the
+    selected years and the cohort is still young enough for a grade with Fall teams (aging
+    out is not attrition). Column 0 is 100 wherever a town has any cohorts.
+    """
+    cells = cohort_index[cohort_index.index.get_level_values('season_year').isin(years)].reset_index()
+    if cells.empty:
+        return pd.DataFrame(index=towns_list, dtype='float64')
+    last_year = cells['season_year'].max()
+    top_grade = cohort_index['grade'].max()
+    offsets = np.arange(last_year - cells['season_year'].min() + 1)
+
+    # Join every season of a cohort to the cohort's first season in the selection
+    entries = cells.loc[cells.groupby(COHORT_KEYS, observed=True)['season_year'].idxmin()]
+    seasons = cells.merge(entries[COHORT_KEYS + ['season_year']], on=COHORT_KEYS, suffixes=('', '_entry'))
+    seasons['k'] = seasons['season_year'] - seasons['season_year_entry']
+    fielded = seasons.pivot_table(index='town_code', columns='k', values='teams', aggfunc='sum',
+                                  fill_value=0, observed=True).reindex(columns=offsets, fill_value=0)
+
+    # Teams at entry of the cohorts still observable k years on (entries x offsets)
+    observable = ((entries['season_year'].to_numpy()[:, None] + offsets <= last_year) &
+                  (entries['grade'].to_numpy()[:, None] + offsets <= top_grade))
+    at_risk = pd.DataFrame(observable * entries['teams'].to_numpy()[:, None], columns=offsets,
+                           index=entries['town_code'].to_numpy()).groupby(level=0).sum()
+
+    fielded = fielded.reindex(towns_list, fill_value=0)
+    at_risk = at_risk.reindex(towns_list, fill_value=0)
+    return (fielded / at_risk * 100).where(at_risk > 0)
+
+
+def cohort_table(cohort_index, town_code, years):
+    """One town's cohorts (rows: class year and gender) by season year: Fall teams fielded"""
+    in_town = cohort_index.index.get_level_values('town_code') == town_code
+    in_years = cohort_index.index.get_level_values('season_year').isin(years)
+    teams = cohort_index.loc[in_town & in_years, 'teams'].droplevel('town_code')
+    table = teams.unstack('season_year').reindex(columns=list(years))
+    return table.reorder_levels(['class_of', 'gender']).sort_index()
@@ -0,0 +1,183 @@
+"""
+Town metrics: team rows are aggregated once into a small (town, year, period)
+cube; every metric and year-range filter is then answered from the cube instead
+of re-filtering the raw data once per town and metric. Ranks and heat-map
+intensities are derived from the metrics frame in one vectorized pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Configured towns (Foxboro and its 7 peers) and their display names
+TOWN_NAMES = {
+    'FOX': 'Foxboro',
+    'ASH': 'Ashland',
+    'BEL': 'Bellingham',
+    'HOP': 'Hopkinton',
+    'HOL': 'Holliston',
+    'MAN': 'Mansfield',
+    'WAL': 'Walpole',
+    'MDY': 'Medway'
+}
+
+# Aggregate cube: one row per (town, year, period) - every metric is derived from these sums
+CUBE_KEYS = ['town_code', 'season_year', 'season_period']
+CUBE_SUM_COLUMNS = ['wins', 'losses', 'ties', 'goals_for', 'goals_against',
+                    'goal_differential', 'division_level']
+
+METRIC_COLUMNS = ['Participation Rate', 'Win %', 'Goal Diff', 'Retention %',
+                  'Goals For', 'Goals Against', 'Avg Division', 'Gender Balance',
+                  'Growth %', 'Enrollment']
+
+
+def build_cube(teams_df):
+    """Aggregate team rows into per (town, year, period) sums and team counts by gender"""
+    # Single pass over the team rows; gender is folded into columns afterwards
+    grouped = teams_df.groupby(CUBE_KEYS + ['gender'], observed=True)
+    cells = grouped[CUBE_SUM_COLUMNS].sum()
+    cells['division_count'] = grouped['division_level'].count()
+    cells['teams'] = grouped.size()
+
+    cube = cells.groupby(level=CUBE_KEYS).sum()
+    by_gender = cells['teams'].unstack('gender', fill_value=0).reindex(columns=['Boys', 'Girls'], fill_value=0)
+    cube['boys_teams'] = by_gender['Boys']
+    cube['girls_teams'] = by_gender['Girls']
+    return cube
+
+
+def select_cube(cube, years, periods):
+    """Slice the cube to the selected season years and periods"""
+    mask = (cube.index.get_level_values('season_year').isin(years) &
+            cube.index.get_level_values('season_period').isin(periods))
+    return cube[mask]
+
+
+def metrics_from_cube(cube, towns_list, enrollment_map, town_names):
+    """Build the metrics frame (one row per town with data) from a cube slice"""
+    teams = cube['teams']
+
+    # Town totals
+    by_town = cube.groupby(level='town_code').sum()
+    by_period = teams.unstack('season_period', fill_value=0) \
+        .groupby(level='town_code').sum().reindex(columns=['Fall', 'Spring'], fill_value=0)
+
+    # Growth baseline/current years per town (first and last year with any teams)
+    year_span = teams.reset_index().groupby('town_code')['season_year'].agg(['min', 'max', 'nunique'])
+    fall_by_year = teams[teams.index.get_level_values('season_period') == 'Fall'] \
+        .droplevel('season_period')
+
+    present = [town for town in towns_list if town in by_town.index and by_town.at[town, 'teams'] > 0]
+    enrollment = pd.Series({town: enrollment_map[town] for town in towns_list}).reindex(present)
+    totals = by_town.reindex(present)
+    total = totals['teams']
+
+    # Participation Rate
+    teams_per_100 = (total / 10) / enrollment * 100
+
+    # Win Percentage (ties count as half a win)
+    total_games = totals['wins'] + totals['losses'] + totals['ties']
+    win_pct = ((totals['wins'] + 0.5 * totals['ties']) / total_games * 100).where(total_games > 0, 0)
+
+    # Goal Differential per Team
+    avg_gd = (totals['goal_differential'] / total).round(1)
+
+    # Spring Retention Rate
+    fall_teams = by_period['Fall'].reindex(present, fill_value=0) / 5
+    spring_teams = by_period['Spring'].reindex(present, fill_value=0) / 5
+    retention = (spring_teams / fall_teams * 100).where(fall_teams > 0, 0)
+
+    # Goals For/Against per Team
+    avg_gf = totals['goals_for'] / total
+    avg_ga = totals['goals_against'] / total
+
+    # Division Distribution
+    avg_division = totals['division_level'] / totals['division_count']
+
+    # Gender Balance (% girls, 50 is perfect)
+    girls_pct = totals['girls_teams'] / total * 100
+
+    # Growth Rate (Fall teams, first year vs last year in the filtered data)
+    span = year_span.reindex(present)
+    fall_baseline = fall_by_year.reindex(list(zip(present, span['min'])), fill_value=0).to_numpy()
+    fall_current = fall_by_year.reindex(list(zip(present, span['max'])), fill_value=0).to_numpy()
+    growth_pct = pd.Series([
+        round(((current - baseline) / baseline) * 100, 1) if n_years >= 2 and baseline > 0 else 0
+        for baseline, current, n_years in zip(fall_baseline.tolist(), fall_current.tolist(), span['nunique'])
+    ], index=present, dtype='float64')
+
+    df_result = pd.DataFrame({
+        'Town': pd.Series([town_names[town] for town in present], index=present, dtype=object),
+        'Participation Rate': teams_per_100.astype('float64'),
+        'Win %': win_pct.astype('float64'),
+        'Goal Diff': avg_gd.astype('float64'),
+        'Retention %': retention.astype('float64'),
+        'Goals For': avg_gf.astype('float64'),
+        'Goals Against': avg_ga.astype('float64'),
+        'Avg Division': avg_division.astype('float64'),
+        'Gender Balance': girls_pct.astype('float64'),
+        'Growth %': growth_pct,
+        'Enrollment': enrollment.astype('int64'),
+    }, index=present)
+
+    return df_result
+
+
+# Which end of each metric's scale ranks first
+RANK_DIRECTIONS = {
+    'Participation Rate': 'higher',
+    'Win %': 'higher',
+    'Goal Diff': 'higher',
+    'Retention %': 'higher',
+    'Goals For': 'higher',
+    'Goals Against': 'lower',
+    'Avg Division': 'lower',        # Division 1 is the top flight
+    'Gender Balance': 'closest_to_50',
+    'Growth %': 'higher',
+}
+
+
+def metric_scores(metrics_df, directions=RANK_DIRECTIONS):
+    """Every metric turned into a higher-is-better score (closest_to_50 scores -|value - 50|)"""
+    return pd.DataFrame({
+        metric: {'higher': metrics_df[metric],
+                 'lower': -metrics_df[metric],
+                 'closest_to_50': -(metrics_df[metric] - 50).abs()}[direction]
+        for metric, direction in directions.items()
+    }, index=metrics_df.index)
+
+
+def rank_metrics(metrics_df, directions=RANK_DIRECTIONS):
+    """Rank every town on every metric in one pass (1 = best).
+
+    Ties share the lower position, i.e. a town's rank is the number of towns at least as
+    good as it; a town with no value for a metric gets rank 0.
+    """
+    scores = metric_scores(metrics_df, directions)
+    return scores.rank(method='max', ascending=False).fillna(0).astype('int64')
+
+
+def heatmap_intensity(metrics_df, directions=RANK_DIRECTIONS):
+    """Signed heat-map intensity of every town and metric relative to the column average.
+
+    Positive values are better than average, scaled so the best town gets 0.5 (for
+    closest_to_50 the scale ends at exactly 50, not at the closest town); negative values
+    are worse than average, scaled so the worst town gets -0.5. Towns at the average or
+    without a value get 0.
+    """
+    scores = metric_scores(metrics_df, directions)
+    values = scores.to_numpy(dtype='float64')
+    avg = scores.mean().to_numpy()
+    best = np.where([direction == 'closest_to_50' for direction in directions.values()],
+                    0.0, scores.max().to_numpy())
+    worst = scores.min().to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        better = np.minimum((values - avg) / (best - avg) * 0.5, 0.5)
+        worse = np.minimum((avg - values) / (avg - worst) * 0.5, 0.5)
+    intensity = np.where(values > avg, better, np.where(values < avg, -worse, 0.0))
+    return pd.DataFrame(intensity, index=scores.index, columns=scores.columns)
+
+
+def build_metrics(teams_df, towns_list, enrollment_map, town_names):
+    """Calculate metrics for all configured towns from raw team rows"""
+    return metrics_from_cube(build_cube(teams_df), towns_list, enrollment_map, town_names)
@@ -0,0 +1,92 @@
+"""
+Per-team records: filtered, sorted row positions for the paginated team table,
+the rows as displayed, and a sorted (town, year, period, age group) index for the drill-down.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .metrics import TOWN_NAMES
+
+# Per-team records (Appendix team table): store column -> display label
+TEAM_TABLE_COLUMNS = {
+    'town_code': 'Town',
+    'season_year': 'Year',
+    'season_period': 'Season',
+    'team_name': 'Team',
+    'age_group': 'Age Group',
+    'gender': 'Gender',
+    'division_full': 'Division',
+    'wins': 'W',
+    'losses': 'L',
+    'ties': 'T',
+    'goals_for': 'GF',
+    'goals_against': 'GA',
+    'goal_differential': 'GD',
+    'points': 'Pts',
+    'final_rank': 'Final Rank',
+    'head_coach': 'Head Coach',
+}
+
+
+def team_order(teams_df, years, periods, town_codes, search='', sort_by='season_year', ascending=True):
+    """Positions of the team rows matching the filters, in display order.
+
+    Only integer positions are returned, so the order is cheap to cache and a caller
+    materializes one page at a time with teams_df.iloc[positions[start:stop]]. search
+    matches team and head coach names (case-insensitive); ties keep store order and
+    missing values sort last.
+    """
+    mask = (teams_df['season_year'].isin(years) & teams_df['season_period'].isin(periods) &
+            teams_df['town_code'].isin(town_codes))
+    positions = np.flatnonzero(mask.to_numpy())
+    if search:
+        candidates = teams_df.iloc[positions]
+        found = (candidates['team_name'].str.contains(search, case=False, regex=False, na=False) |
+                 candidates['head_coach'].str.contains(search, case=False, regex=False, na=False))
+        positions = positions[found.to_numpy()]
+
+    keys = teams_df[sort_by].iloc[positions].reset_index(drop=True)
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # Store categories are in first-seen order; sort on the labels instead
+        keys = keys.astype(str)
+    order = keys.sort_values(ascending=ascending, kind='stable', na_position='last').index
+    return positions[order.to_numpy()]
+
+
+def team_table(teams, town_names=TOWN_NAMES):
+    """Team rows as displayed: TEAM_TABLE_COLUMNS with their labels and town display names"""
+    table = teams[list(TEAM_TABLE_COLUMNS)]
+    table = table.assign(town_code=table['town_code'].astype(str).map(town_names))
+    return table.rename(columns=TEAM_TABLE_COLUMNS).reset_index(drop=True)
+
+
+# Drill-down index: team rows sorted on these levels, so one town/season (and optionally one
+# age group) is a binary search on the index instead of a chain of full-frame boolean masks
+TEAM_INDEX_LEVELS = ['town_code', 'season_year', 'season_period', 'age_group']
+
+
+def age_group_key(age_group):
+    """Sort key putting age groups in grade order ('Grade 3' before 'Grade 10')"""
+    grade = re.search(r'\d+', age_group)
+    return (int(grade.group()) if grade else float('inf'), age_group)
+
+
+def build_team_index(teams_df):
+    """Team rows indexed and sorted on TEAM_INDEX_LEVELS, age groups in grade order"""
+    age_groups = teams_df['age_group'].astype('category')
+    age_groups = age_groups.cat.reorder_categories(sorted(age_groups.cat.categories, key=age_group_key))
+    return teams_df.assign(age_group=age_groups).set_index(TEAM_INDEX_LEVELS).sort_index(kind='stable')
+
+
+def drill_down(team_index, town_code, season_year, season_period, age_group=None):
+    """Teams of one town and season (optionally one age group) sliced from build_team_index's frame"""
+    key = (town_code, season_year, season_period) + (() if age_group is None else (age_group,))
+    try:
+        start, stop = team_index.index.slice_locs(key, key)
+    except (KeyError, TypeError):
+        # A label the index has never seen (e.g. a town with no teams at all)
+        start = stop = 0
+    return team_index.iloc[start:stop]
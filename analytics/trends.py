@@ -0,0 +1,85 @@
+"""
+Per-year trend series (Trends Over Time): the cube is pivoted once to one row
+per (town, year), then each focus town is compared with the average of the
+other towns.
+"""
+
+import pandas as pd
+
+# Metrics plotted on the Trends Over Time tab (focus town vs peer average)
+TIME_SERIES_METRICS = ['Win %', 'Goal Diff', 'Goals For', 'Goals Against', 'Participation Rate',
+                       'Retention %', 'Growth %', 'Gender Balance', 'Avg Division']
+
+
+def _none_if_nan(values):
+    return [None if pd.isna(val) else float(val) for val in values]
+
+
+def _yearly_metrics(cube, enrollment_map):
+    """Pivot the cube to one row per (town, year) of trend metrics; returns (years, yearly, has_games)"""
+    years = sorted(int(year) for year in cube.index.get_level_values('season_year').unique())
+
+    # Pivot the cube to one row per (town, year) with Fall/Spring team counts alongside the sums
+    by_year = cube.groupby(level=['town_code', 'season_year']).sum()
+    periods = cube['teams'].unstack('season_period', fill_value=0).reindex(columns=['Fall', 'Spring'], fill_value=0)
+    by_year = by_year.join(periods.groupby(level=['town_code', 'season_year']).sum())
+
+    teams = by_year['teams']
+    town_codes = by_year.index.get_level_values('town_code')
+    year_values = by_year.index.get_level_values('season_year')
+    enrollment = pd.Series([enrollment_map.get(town, 2500) for town in town_codes], index=by_year.index)
+
+    total_games = by_year['wins'] + by_year['losses'] + by_year['ties']
+    first_year = min(years) if years else None
+    first_fall = by_year['Fall'][year_values == first_year].droplevel('season_year')
+    first_fall = first_fall.reindex(town_codes).to_numpy()
+
+    yearly = pd.DataFrame({
+        'Win %': ((by_year['wins'] + 0.5 * by_year['ties']) / total_games * 100).where(total_games > 0, 0),
+        'Goal Diff': by_year['goal_differential'] / teams,
+        'Goals For': by_year['goals_for'] / teams,
+        'Goals Against': by_year['goals_against'] / teams,
+        'Participation Rate': (teams / 10) / enrollment * 100,
+        # Retention for this year (Fall to Spring); undefined without Fall teams
+        'Retention %': (by_year['Spring'] / by_year['Fall'] * 100).where(by_year['Fall'] > 0),
+        # Growth: this year's Fall vs the first year's Fall; undefined without a baseline
+        'Growth %': ((by_year['Fall'] - first_fall) / first_fall * 100).where(first_fall > 0),
+        'Gender Balance': by_year['girls_teams'] / teams * 100,
+        'Avg Division': by_year['division_level'] / by_year['division_count'],
+    }, index=by_year.index)
+    yearly.loc[year_values == first_year, 'Growth %'] = 0.0
+    return years, yearly, (total_games > 0).to_numpy()
+
+
+def _focus_series(years, yearly, has_games, focus_town, towns_list):
+    """Focus town vs the average of the other towns, per metric, from the yearly pivot"""
+    town_codes = yearly.index.get_level_values('town_code')
+
+    # Focus town: gaps (None) for years without any teams
+    if focus_town in town_codes:
+        focus = yearly.xs(focus_town, level='town_code').reindex(years)
+    else:
+        focus = pd.DataFrame(index=years, columns=TIME_SERIES_METRICS, dtype='float64')
+
+    # League average excluding the focus town; only towns with games played count,
+    # and a missing retention/growth value counts as 0 for that town
+    peers = yearly[town_codes.isin([town for town in towns_list if town != focus_town]) & has_games]
+    peers = peers.fillna({'Retention %': 0, 'Growth %': 0})
+    peer_avg = peers.groupby(level='season_year').mean().reindex(years)
+
+    return {
+        metric: {'Focus': _none_if_nan(focus[metric]), 'Avg': _none_if_nan(peer_avg[metric])}
+        for metric in TIME_SERIES_METRICS
+    }
+
+
+def build_time_series(cube, focus_town, towns_list, enrollment_map):
+    """Per-year metrics for the focus town and the average of the other towns, from one pivot"""
+    years, yearly, has_games = _yearly_metrics(cube, enrollment_map)
+    return years, _focus_series(years, yearly, has_games, focus_town, towns_list)
+
+
+def build_time_series_by_town(cube, towns_list, enrollment_map):
+    """build_time_series with every town in towns_list as the focus; returns (years, {town: series})"""
+    years, yearly, has_games = _yearly_metrics(cube, enrollment_map)
+    return years, {town: _focus_series(years, yearly, has_games, town, towns_list) for town in towns_list}
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Read-only HTTP API over the dashboard's numbers.
+Serves the metrics table, ranks, trend series and program assessment of any
+year range (and focus town) as JSON or CSV. Selections come from the metrics
+snapshot when it covers them and are computed from the team data otherwise,
+once per data version. Every response body is built once per data version and
+request, kept in memory with a strong ETag and a pre-compressed gzip copy, and
+served with Cache-Control; a matching If-None-Match gets 304. Repeat clients
+never touch pandas and never start a Streamlit session.
+
+    python api.py --port 8600              # the API on its own
+    streamlit run server.py                # the dashboard with the API mounted at /api
+
+    GET /api/v1/meta
+    GET /api/v1/metrics?first=2021&last=2025[&format=csv]
+    GET /api/v1/ranks?first=2021&last=2025[&format=csv]
+    GET /api/v1/towns/FOX/time-series?first=2021&last=2025[&format=csv]
+    GET /api/v1/towns/FOX/assessment?first=2021&last=2025
+"""
+
+import argparse
+import functools
+import gzip
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pandas as pd
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from analytics import (METRIC_COLUMNS, RANK_DIRECTIONS, TIME_SERIES_METRICS, TOWN_NAMES, assess_town, build_cube,
+                       build_time_series_by_town, metrics_from_cube, rank_metrics, select_cube)
+from data_store import ENROLLMENT_CSV, TEAMS_CSV, data_version, load_teams
+from snapshot import SNAPSHOT_PERIODS, load_snapshot
+
+# Numbers only change when the scraper writes new CSVs; clients revalidate with the ETag after this
+CACHE_CONTROL = 'public, max-age=300'
+MAX_CACHED_BODIES = 1024
+
+TOWNS = tuple(TOWN_NAMES)
+
+
+class ApiError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Data layer: one loaded snapshot / team cube per data version, one computed selection per year range
+@functools.lru_cache(maxsize=2)
+def get_snapshot(version):
+    return load_snapshot()
+
+
+@functools.lru_cache(maxsize=2)
+def load_league(version):
+    """(cube, enrollment_map) of one data version, for selections the snapshot does not cover"""
+    enrollment_df = pd.read_csv(ENROLLMENT_CSV)
+    return build_cube(load_teams(TEAMS_CSV)), dict(zip(enrollment_df['town_code'], enrollment_df['enrollment']))
+
+
+def league_years(version):
+    snapshot = get_snapshot(version)
+    if snapshot is not None:
+        return list(snapshot.years)
+    cube, _ = load_league(version)
+    return sorted(int(year) for year in cube.index.get_level_values('season_year').unique())
+
+
+@functools.lru_cache(maxsize=64)
+def selection(version, year_range):
+    """(metrics_df, ranks_df, years, time_series_by_town) for an inclusive year range"""
+    snapshot = get_snapshot(version)
+    metrics_df = time_series = None
+    if snapshot is not None:
+        metrics_df = snapshot.metrics(year_range, SNAPSHOT_PERIODS, TOWNS)
+        time_series = snapshot.time_series(year_range, SNAPSHOT_PERIODS, TOWNS)
+    if metrics_df is None or time_series is None:
+        cube, enrollment_map = load_league(version)
+        cube_slice = select_cube(cube, range(year_range[0], year_range[1] + 1), SNAPSHOT_PERIODS)
+        metrics_df = metrics_from_cube(cube_slice, list(TOWNS), enrollment_map, TOWN_NAMES)
+        time_series = build_time_series_by_town(cube_slice, list(TOWNS), enrollment_map)
+    return (metrics_df, rank_metrics(metrics_df)) + tuple(time_series)
+
+
+# Response bodies: (media type, body) per resource and format
+def _json(document):
+    return 'application/json', json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _csv(frame):
+    buffer = io.StringIO()
+    frame.to_csv(buffer)
+    return 'text/csv; charset=utf-8', buffer.getvalue().encode('utf-8')
+
+
+def _records(frame):
+    """Frame rows as {index: {column: value}} with missing values as null"""
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient='index')
+
+
+def meta_body(version, fmt):
+    return _json({
+        'data_version': version,
+        'years': league_years(version),
+        'periods': list(SNAPSHOT_PERIODS),
+        'towns': TOWN_NAMES,
+        'metrics': METRIC_COLUMNS,
+        'rank_directions': RANK_DIRECTIONS,
+    })
+
+
+def metrics_body(version, fmt, year_range):
+    metrics_df = selection(version, year_range)[0]
+    if fmt == 'csv':
+        return _csv(metrics_df.rename_axis('town_code'))
+    return _json({'year_range': list(year_range), 'metrics': _records(metrics_df)})
+
+
+def ranks_body(version, fmt, year_range):
+    ranks_df = selection(version, year_range)[1]
+    if fmt == 'csv':
+        return _csv(ranks_df.rename_axis('town_code'))
+    return _json({'year_range': list(year_range), 'ranks': _records(ranks_df)})
+
+
+def time_series_body(version, fmt, year_range, town):
+    _, _, years, time_series_by_town = selection(version, year_range)
+    series = time_series_by_town[town]
+    if fmt == 'csv':
+        columns = {}
+        for metric in TIME_SERIES_METRICS:
+            columns[metric] = series[metric]['Focus']
+            columns[f'{metric} (League Avg)'] = series[metric]['Avg']
+        return _csv(pd.DataFrame(columns, index=pd.Index(years, name='season_year')))
+    return _json({'year_range': list(year_range), 'town': town, 'years': years, 'series': series})
+
+
+def assessment_body(version, fmt, year_range, town):
+    if fmt == 'csv':
+        raise ApiError(400, 'The assessment is only available as JSON')
+    metrics_df, ranks_df, years, time_series_by_town = selection(version, year_range)
+    if town not in metrics_df.index:
+        raise ApiError(404, f'{TOWN_NAMES[town]} has no teams in {year_range[0]}-{year_range[1]}')
+    assessment = assess_town(metrics_df, ranks_df, years, time_series_by_town[town], town, TOWN_NAMES[town])
+    return _json({
+        'year_range': list(year_range),
+        'town': town,
+        'grades': assessment.grades,
+        'gender_balance_declining': assessment.gender_balance_declining,
+        'concerns': assessment.concerns,
+        'strengths': assessment.strengths,
+        'priorities': [{'timeframe': timeframe, 'action': action} for timeframe, action in assessment.priorities],
+    })
+
+
+class CachedBody(NamedTuple):
+    media_type: str
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+def cached_body(media_type, body):
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return CachedBody(media_type, body, gzip.compress(body, mtime=0), f'"{digest}"')
+
+
+_bodies = OrderedDict()
+_bodies_lock = threading.Lock()
+
+
+def build_body(key, render, *args):
+    """Render a response body and keep it (and its gzip copy) for later requests with the same key"""
+    entry = cached_body(*render(*args))
+    with _bodies_lock:
+        _bodies[key] = entry
+        while len(_bodies) > MAX_CACHED_BODIES:
+            _bodies.popitem(last=False)
+    return entry
+
+
+def lookup_body(key):
+    """A kept body, marked as most recently used so eviction drops the least recently used first"""
+    with _bodies_lock:
+        entry = _bodies.get(key)
+        if entry is not None:
+            _bodies.move_to_end(key)
+    return entry
+
+
+def accepts_gzip(request):
+    for coding in request.headers.get('accept-encoding', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip() in ('gzip', '*') and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            return True
+    return False
+
+
+def not_modified(request, etags):
+    """True when If-None-Match names one of the current ETags (weak comparison, as RFC 9110 requires)"""
+    header = request.headers.get('if-none-match')
+    if header is None:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') in etags for tag in header.split(','))
+
+
+def error_response(status_code, message):
+    media_type, body = _json({'error': message})
+    return Response(body, status_code=status_code, media_type=media_type, headers={'Cache-Control': 'no-store'})
+
+
+def requested_years(request, version):
+    """Inclusive (first, last) from the first/last query parameters, defaulting to every year"""
+    years = league_years(version)
+    try:
+        first = int(request.query_params.get('first', years[0]))
+        last = int(request.query_params.get('last', years[-1]))
+    except ValueError:
+        raise ApiError(400, 'first and last must be years')
+    if not years[0] <= first <= last <= years[-1]:
+        raise ApiError(400, f'Years must satisfy {years[0]} <= first <= last <= {years[-1]}')
+    return first, last
+
+
+async def serve(request, render, with_years=True, with_town=False):
+    fmt = request.query_params.get('format', 'json')
+    if fmt not in ('json', 'csv'):
+        return error_response(400, 'format must be json or csv')
+    version = data_version()
+    try:
+        year_range = await run_in_threadpool(requested_years, request, version) if with_years else None
+        town = None
+        if with_town:
+            town = request.path_params['town'].upper()
+            if town not in TOWN_NAMES:
+                raise ApiError(404, f"Unknown town {request.path_params['town']!r}; one of {', '.join(TOWNS)}")
+        # Keyed on the parsed request, so parameter order, case and unknown parameters don't add entries
+        key = (version, render.__name__, fmt, year_range, town)
+        entry = lookup_body(key)
+        if entry is None:
+            args = [version, fmt]
+            if with_years:
+                args.append(year_range)
+            if with_town:
+                args.append(town)
+            # Computing a selection is CPU-bound pandas work; keep it off the event loop
+            entry = await run_in_threadpool(build_body, key, render, *args)
+    except ApiError as error:
+        return error_response(error.status_code, str(error))
+
+    use_gzip = accepts_gzip(request)
+    etag = entry.etag[:-1] + '-gzip"' if use_gzip else entry.etag
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+    if not_modified(request, (entry.etag, entry.etag[:-1] + '-gzip"')):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    return Response(entry.gzip_body if use_gzip else entry.body, media_type=entry.media_type, headers=headers)
+
+
+async def meta(request):
+    return await serve(request, meta_body, with_years=False)
+
+
+async def metrics(request):
+    return await serve(request, metrics_body)
+
+
+async def ranks(request):
+    return await serve(request, ranks_body)
+
+
+async def time_series(request):
+    return await serve(request, time_series_body, with_town=True)
+
+
+async def assessment(request):
+    return await serve(request, assessment_body, with_town=True)
+
+
+# Paths below the /api mount (shared by the standalone app and server.py)
+routes = [
+    Route('/v1/meta', meta),
+    Route('/v1/metrics', metrics),
+    Route('/v1/ranks', ranks),
+    Route('/v1/towns/{town}/time-series', time_series),
+    Route('/v1/towns/{town}/assessment', assessment),
+]
+
+app = Starlette(routes=[Mount('/api', routes=routes)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the read-only metrics API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='info')
+
+
+if __name__ == '__main__':
+    main()
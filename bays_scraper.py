@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+BAYS standings scraper.
+Fetches one standings page per (town, season) concurrently over a bounded
+thread pool with per-thread keep-alive sessions, and parses each page into
+rows of the data/bays_teams.csv schema.
+
+The page layout follows the column standard in CURRENT_STATUS.md (Team name,
+Team number, GADS, W, L, T, Forfeits, Points, GF, GA, +/-, Head Coach,
+Assistant Coach). fixture_server.py replays saved pages in that layout so the
+scraper can be run and benchmarked offline:
+
+    python bays_scraper.py --fixtures --benchmark
+    python bays_scraper.py --base-url https://bays.org --towns FOX --years 2025 --output new_rows.csv
+
+Incremental mode keeps an ETag/Last-Modified/content-hash record per page in
+data/scrape_state.json, skips pages that have not changed and upserts only the
+affected town/season rows into the CSV:
+
+    python bays_scraper.py --base-url https://bays.org --years 2025 --periods Fall \\
+        --incremental --update data/bays_teams.csv
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from html.parser import HTMLParser
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from data_store import TEAM_COLUMNS
+
+# Town configuration (BAYS club name and 2020 Census population)
+TOWNS = {
+    'FOX': ('Foxborough Youth Soccer', 18618),
+    'ASH': ('Ashland Youth Soccer', 18832),
+    'BEL': ('Bellingham Soccer Association', 16945),
+    'HOL': ('Holliston Youth Soccer Association', 15494),
+    'HOP': ('Hopkinton Youth Soccer', 18758),
+    'MAN': ('Mansfield Youth Soccer', 25067),
+    'MDY': ('Medway Youth Soccer', 13115),
+    'WAL': ('Walpole Youth Soccer Association', 24070),
+}
+SEASON_YEARS = [2021, 2022, 2023, 2024, 2025]
+SEASON_PERIODS = ['Fall', 'Spring']
+
+# One standings page per town and season
+STANDINGS_PATH = '/standings/{town_code}/{season_year}/{season_period}'
+
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 20
+
+# Per-page validators from the last successful scrape (incremental mode)
+SCRAPE_STATE = 'data/scrape_state.json'
+SEASON_KEYS = ['town_code', 'season_year', 'season_period']
+
+# Standings table header -> field (matched case-insensitively)
+HEADER_FIELDS = {
+    'team': 'team_name',
+    'team name': 'team_name',
+    'team #': 'team_number',
+    'team number': 'team_number',
+    'gads': 'gads',
+    'w': 'wins',
+    'l': 'losses',
+    't': 'ties',
+    'f': 'forfeits',
+    'pts': 'points',
+    'points': 'points',
+    'gf': 'goals_for',
+    'ga': 'goals_against',
+    '+/-': 'goal_differential',
+    'head coach': 'head_coach',
+    'asst coach': 'assistant_coach',
+    'assistant coach': 'assistant_coach',
+}
+INT_FIELDS = ['wins', 'losses', 'ties', 'points', 'goals_for', 'goals_against', 'goal_differential']
+
+# GADS (Gender Age Division/Section), e.g. "G 7/8 3/E" or "B5 4/A1"
+GADS_PATTERN = re.compile(
+    r'^(?P<gender>Boys|Girls|B|G)\s*(?:Grade\s*)?(?P<grade>\d{1,2}(?:/\d{1,2})?)\s+'
+    r'(?P<level>[1-4])\s*/\s*(?P<tier>[A-Z]{1,2}\d?)$',
+    re.IGNORECASE
+)
+
+
+def normalize_age_group(grade):
+    """Map a GADS grade to the dashboard age group (7 and 8 are always combined, as are 1 and 2)"""
+    if grade in ('7', '8', '7/8'):
+        return 'Grade 7/8'
+    if grade in ('1', '2', '1/2'):
+        return 'Grade 1/2'
+    return f'Grade {grade}'
+
+
+def parse_gads(gads):
+    """Split a GADS cell into gender, age group and division fields"""
+    match = GADS_PATTERN.match(gads.strip())
+    if match is None:
+        raise ValueError(f'Unrecognized GADS value: {gads!r}')
+    level = int(match.group('level'))
+    tier = match.group('tier').upper()
+    return {
+        'gender': 'Girls' if match.group('gender')[0].upper() == 'G' else 'Boys',
+        'age_group': normalize_age_group(match.group('grade')),
+        'division_level': level,
+        'division_tier': tier,
+        'division_full': f'Division {level}{tier}',
+    }
+
+
+class StandingsParser(HTMLParser):
+    """Collect header and body cell text from the standings table"""
+
+    def __init__(self):
+        super().__init__()
+        self.header = []
+        self.rows = []
+        self._in_table = False
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table' and 'standings' in (dict(attrs).get('class') or '').split():
+            self._in_table = True
+        elif self._in_table and tag == 'tr':
+            self._row = []
+        elif self._in_table and tag in ('td', 'th') and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if not self._in_table:
+            return
+        if tag in ('td', 'th') and self._cell is not None:
+            self._row.append(' '.join(''.join(self._cell).split()))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            if not self.header:
+                self.header = self._row
+            elif self._row:
+                self.rows.append(self._row)
+            self._row = None
+        elif tag == 'table':
+            self._in_table = False
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_standings(html, town_code, season_year, season_period, scrape_date):
+    """Parse one town/season standings page into bays_teams.csv rows"""
+    parser = StandingsParser()
+    parser.feed(html)
+    parser.close()
+
+    fields = [HEADER_FIELDS.get(name.lower()) for name in parser.header]
+    if 'team_name' not in fields or 'gads' not in fields:
+        raise ValueError(f'No standings table found for {town_code} {season_period} {season_year}')
+
+    town_name, town_population = TOWNS[town_code]
+    rows = []
+    for cells in parser.rows:
+        raw = {field: value for field, value in zip(fields, cells) if field}
+        row = {
+            'town_code': town_code,
+            'town_name': town_name,
+            'town_population': town_population,
+            'season_year': season_year,
+            'season_period': season_period,
+            'team_name': raw['team_name'],
+            **parse_gads(raw['gads']),
+            'final_rank': None,
+            'total_teams_in_division': None,
+            'head_coach': raw.get('head_coach') or None,
+            'assistant_coach': raw.get('assistant_coach') or None,
+            'scrape_date': scrape_date,
+        }
+        for field in INT_FIELDS:
+            row[field] = int(raw[field].replace('+', ''))
+        rows.append(row)
+    return rows
+
+
+def season_targets(towns=None, years=None, periods=None):
+    """All (town_code, season_year, season_period) pages to fetch"""
+    return [(town, year, period)
+            for town in (towns or list(TOWNS))
+            for year in (years or SEASON_YEARS)
+            for period in (periods or SEASON_PERIODS)]
+
+
+class PageFetcher:
+    """Concurrent page fetcher: bounded worker pool, one keep-alive session per worker thread"""
+
+    def __init__(self, base_url, max_workers=DEFAULT_WORKERS, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.headers['User-Agent'] = 'bays-soccer-scraper (personal use)'
+            self._local.session = session
+        return session
+
+    def url_for(self, target):
+        town_code, season_year, season_period = target
+        return self.base_url + STANDINGS_PATH.format(
+            town_code=town_code, season_year=season_year, season_period=season_period)
+
+    def fetch(self, target, headers=None):
+        """GET one standings page; returns the response (raises for HTTP errors other than 304)"""
+        response = self._session().get(self.url_for(target), headers=headers, timeout=self.timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def map(self, func, targets):
+        """Run func(target) over the worker pool; returns [(target, result or exception)] in order"""
+        def run(target):
+            try:
+                return target, func(target)
+            except (requests.RequestException, ValueError) as exc:
+                return target, exc
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(run, targets))
+
+
+def scrape(targets, base_url, max_workers=DEFAULT_WORKERS, scrape_date=None):
+    """Fetch and parse every target page; returns (teams DataFrame, stats dict)"""
+    scrape_date = scrape_date or date.today().isoformat()
+    fetcher = PageFetcher(base_url, max_workers=max_workers)
+
+    def fetch_and_parse(target):
+        response = fetcher.fetch(target)
+        return parse_standings(response.text, *target, scrape_date)
+
+    started = time.perf_counter()
+    results = fetcher.map(fetch_and_parse, targets)
+    elapsed = time.perf_counter() - started
+
+    rows = []
+    failures = {}
+    for target, result in results:
+        if isinstance(result, Exception):
+            failures[target] = str(result)
+        else:
+            rows.extend(result)
+
+    stats = {
+        'pages': len(targets),
+        'failed': len(failures),
+        'teams': len(rows),
+        'seconds': round(elapsed, 3),
+        'pages_per_sec': round(len(targets) / elapsed, 1) if elapsed > 0 else None,
+        'workers': max_workers,
+    }
+    for (town_code, season_year, season_period), error in failures.items():
+        print(f'Failed {town_code} {season_period} {season_year}: {error}', file=sys.stderr)
+    return pd.DataFrame(rows, columns=TEAM_COLUMNS), stats
+
+
+def state_key(target):
+    """State file key for a page, e.g. 'FOX/2025/Fall'"""
+    return '/'.join(str(part) for part in target)
+
+
+def load_state(path=SCRAPE_STATE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_atomic(path, text):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def save_state(state, path=SCRAPE_STATE):
+    _write_atomic(path, json.dumps(state, indent=1, sort_keys=True) + '\n')
+
+
+def scrape_incremental(targets, base_url, state, max_workers=DEFAULT_WORKERS, scrape_date=None):
+    """Fetch pages with conditional requests and parse only the ones whose content changed.
+
+    Returns (teams DataFrame for the changed pages, changed targets, updated state, stats).
+    A page is unchanged when the server answers 304 or the body hashes to the recorded value.
+    """
+    scrape_date = scrape_date or date.today().isoformat()
+    fetcher = PageFetcher(base_url, max_workers=max_workers)
+
+    def fetch_if_changed(target):
+        previous = state.get(state_key(target), {})
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        response = fetcher.fetch(target, headers=headers)
+        if response.status_code == 304:
+            return None
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': content_hash,
+            'scrape_date': scrape_date,
+        }
+        if content_hash == previous.get('sha256'):
+            # Server without validators (or a touched page): same bytes, nothing to do
+            return None, {**previous, 'etag': entry['etag'], 'last_modified': entry['last_modified']}
+        return parse_standings(response.text, *target, scrape_date), entry
+
+    started = time.perf_counter()
+    results = fetcher.map(fetch_if_changed, targets)
+    elapsed = time.perf_counter() - started
+
+    new_state = dict(state)
+    rows = []
+    changed = []
+    failures = {}
+    for target, result in results:
+        if isinstance(result, Exception):
+            failures[target] = str(result)
+            continue
+        if result is None:
+            continue
+        page_rows, entry = result
+        new_state[state_key(target)] = entry
+        if page_rows is not None:
+            rows.extend(page_rows)
+            changed.append(target)
+
+    stats = {
+        'pages': len(targets),
+        'changed': len(changed),
+        'unchanged': len(targets) - len(changed) - len(failures),
+        'failed': len(failures),
+        'teams': len(rows),
+        'seconds': round(elapsed, 3),
+        'pages_per_sec': round(len(targets) / elapsed, 1) if elapsed > 0 else None,
+        'workers': max_workers,
+    }
+    for (town_code, season_year, season_period), error in failures.items():
+        print(f'Failed {town_code} {season_period} {season_year}: {error}', file=sys.stderr)
+    return pd.DataFrame(rows, columns=TEAM_COLUMNS), changed, new_state, stats
+
+
+def upsert_seasons(existing_df, new_df, targets):
+    """Replace the rows of each target (town, year, period) with new_df's rows for it.
+
+    Replaced seasons keep their position in the file; seasons not seen before are appended.
+    """
+    target_keys = {(town, str(year), period) for town, year, period in targets}
+    existing_keys = list(zip(*(existing_df[key].astype(str) for key in SEASON_KEYS)))
+    replaced = pd.Series([key in target_keys for key in existing_keys], index=existing_df.index)
+
+    # Sort anchors: kept rows stay where they are, new rows slot in where their season was
+    first_row = {}
+    for position, key in enumerate(existing_keys):
+        first_row.setdefault(key, position)
+    kept = existing_df[~replaced.to_numpy()].assign(
+        _anchor=[position for position, flag in enumerate(replaced) if not flag], _order=0)
+    new_keys = list(zip(*(new_df[key].astype(str) for key in SEASON_KEYS)))
+    added = new_df.assign(
+        _anchor=[first_row.get(key, len(existing_df)) for key in new_keys],
+        _order=range(1, len(new_df) + 1))
+
+    merged = pd.concat([kept, added], ignore_index=True)
+    merged = merged.sort_values(['_anchor', '_order'], kind='stable')
+    return merged.drop(columns=['_anchor', '_order']).reset_index(drop=True)
+
+
+def update_csv(csv_path, new_df, targets):
+    """Upsert scraped seasons into bays_teams.csv, leaving every other line byte-for-byte intact"""
+    existing_df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    new_df = new_df.astype(object).where(new_df.notna(), '').astype(str)
+    merged = upsert_seasons(existing_df, new_df, targets)
+    _write_atomic(csv_path, merged.to_csv(index=False))
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scrape BAYS standings into the bays_teams.csv schema')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--base-url', help='Site serving the standings pages')
+    source.add_argument('--fixtures', action='store_true',
+                        help='Scrape the saved pages through a local fixture server')
+    parser.add_argument('--towns', nargs='+', choices=list(TOWNS), help='Town codes (default: all)')
+    parser.add_argument('--years', nargs='+', type=int, help='Season years (default: 2021-2025)')
+    parser.add_argument('--periods', nargs='+', choices=SEASON_PERIODS, help='Season periods (default: both)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent requests')
+    parser.add_argument('--output', help='Write the scraped teams to this CSV')
+    parser.add_argument('--update', metavar='CSV', help='Upsert the scraped seasons into this CSV (e.g. data/bays_teams.csv)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip pages unchanged since the last scrape (ETag/Last-Modified/content hash)')
+    parser.add_argument('--state', default=SCRAPE_STATE, help='Incremental scrape state file')
+    parser.add_argument('--benchmark', action='store_true', help='Print throughput stats as JSON')
+    parser.add_argument('--repeat', type=int, default=1, help='Fetch the target list this many times (benchmark)')
+    parser.add_argument('--delay', type=float, default=0.0, help='Fixture server latency per page in seconds')
+    parser.add_argument('--fixtures-dir', help='Saved pages to serve with --fixtures (default: fixtures/standings)')
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if args.fixtures:
+        from fixture_server import FIXTURES_DIR, saved_targets, start_fixture_server
+        fixtures_dir = args.fixtures_dir or FIXTURES_DIR
+        server, base_url = start_fixture_server(delay=args.delay, fixtures_dir=fixtures_dir)
+        targets = [target for target in saved_targets(fixtures_dir)
+                   if (not args.towns or target[0] in args.towns)
+                   and (not args.years or target[1] in args.years)
+                   and (not args.periods or target[2] in args.periods)]
+    else:
+        targets = season_targets(args.towns, args.years, args.periods)
+
+    try:
+        if args.incremental or args.update:
+            # A full --update refetches every target but still records it alongside the other pages' state
+            saved_state = load_state(args.state)
+            teams_df, changed, state, stats = scrape_incremental(
+                targets, base_url, saved_state if args.incremental else {}, max_workers=args.workers)
+            state = {**saved_state, **state}
+        else:
+            teams_df, stats = scrape(targets * args.repeat, base_url, max_workers=args.workers)
+            changed = targets
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.output:
+        teams_df.to_csv(args.output, index=False)
+    if args.update and changed:
+        update_csv(args.update, teams_df, changed)
+    if args.incremental or args.update:
+        save_state(state, args.state)
+    if args.benchmark:
+        print(json.dumps(stats))
+    elif 'changed' in stats:
+        print(f"{stats['changed']} changed, {stats['unchanged']} unchanged, {stats['failed']} failed pages; "
+              f"{stats['teams']} teams upserted in {stats['seconds']}s")
+    else:
+        print(f"Scraped {stats['teams']} teams from {stats['pages'] - stats['failed']}/{stats['pages']} pages "
+              f"in {stats['seconds']}s ({stats['pages_per_sec']} pages/sec)")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
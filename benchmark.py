@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the dashboard's compute paths.
+Generates synthetic leagues in the bays_teams.csv schema at multiples of
+today's size (more towns, seasons and age groups), runs every stage the
+dashboard computes - ingest, load, metrics, trend series, the program
+assessment, charts, the Appendix Styler, coach and cohort analytics -
+headlessly, and reports the fastest wall time of each stage as JSON.
+
+    python benchmark.py                                   # 1x, 10x and 100x
+    python benchmark.py --scales 1 10 100 1000 --output benchmark.json
+    python benchmark.py --baseline benchmark.json         # exit 1 if a stage got slower
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import (TOWN_NAMES, assess_town, build_coach_index, build_cohort_index, build_cube, build_team_index,
+                       build_time_series_by_town, coach_records, coach_retention, drill_down, metrics_from_cube,
+                       rank_metrics, select_cube, survival_curves, team_order)
+from charts import BAR_CHARTS, TREND_CHARTS, build_bar_chart, build_trend_chart, style_metrics_table
+from data_store import TEAM_COLUMNS, load_teams
+from ingest import ingest_csv
+
+# Today's league: 1,846 team seasons, 8 towns, 2021-2025
+BASE_ROWS = 1846
+BASE_YEARS = list(range(2021, 2026))
+DEFAULT_SCALES = [1, 10, 100]
+
+AGE_GROUPS = ['Grade 3', 'Grade 4', 'Grade 5', 'Grade 6', 'Grade 7/8']
+EXTRA_AGE_GROUPS = ['Grade 1/2', 'Grade 10', 'Grade 11', 'Grade 12']
+PERIODS = ['Fall', 'Spring']
+GENDERS = ['Boys', 'Girls']
+MASCOTS = ['Warriors', 'Hurricanes', 'Lynx', 'Mustangs', 'Barracuda', 'Blackhawks', 'Thunder', 'Strikers',
+           'Falcons', 'Rockets', 'Wolves', 'Cobras']
+FIRST_NAMES = ['Alex', 'Chris', 'Dana', 'Erin', 'Jamie', 'Jordan', 'Kelly', 'Morgan', 'Pat', 'Robin',
+               'Sam', 'Taylor', 'Casey', 'Drew', 'Jesse', 'Lee']
+LAST_NAMES = ['Brooks', 'Carter', 'Donovan', 'Fitzgerald', 'Greene', 'Hughes', 'Kelley', 'Lynch',
+              'Morrison', 'Nolan', 'Perry', 'Quinn', 'Reilly', 'Sullivan', 'Walsh', 'Young']
+
+# Regressions are only reported above this many seconds, below it timer noise dominates
+NOISE_FLOOR = 0.005
+
+
+def league_shape(scale):
+    """Towns, season years and age groups of a synthetic league scale times today's size"""
+    n_towns = max(len(TOWN_NAMES), round(len(TOWN_NAMES) * scale ** 0.6))
+    n_years = max(len(BASE_YEARS), round(len(BASE_YEARS) * scale ** 0.15))
+    towns = list(TOWN_NAMES) + [f'T{i:03d}' for i in range(1, n_towns - len(TOWN_NAMES) + 1)]
+    years = list(range(BASE_YEARS[-1] - n_years + 1, BASE_YEARS[-1] + 1))
+    age_groups = AGE_GROUPS + (EXTRA_AGE_GROUPS if scale > 1 else [])
+    return towns, years, age_groups
+
+
+def generate_league(scale, seed=0):
+    """Synthetic (teams_df, enrollment_df) in the bays_teams.csv / school_enrollment.csv schemas"""
+    rng = np.random.default_rng(seed)
+    towns, years, age_groups = league_shape(scale)
+    n_rows = round(BASE_ROWS * scale)
+
+    # Spread the rows over every (town, year, period, age group, gender) cell; bigger towns
+    # field more teams and Spring fields fewer than Fall
+    grid = pd.MultiIndex.from_product([range(len(towns)), years, PERIODS, age_groups, GENDERS],
+                                      names=['town', 'season_year', 'season_period', 'age_group', 'gender'])
+    cells = grid.to_frame(index=False)
+    town_size = rng.lognormal(0, 0.4, len(towns))
+    weights = town_size[cells['town']] * np.where(cells['season_period'] == 'Fall', 1.0, 0.85)
+    counts = rng.multinomial(n_rows, weights / weights.sum())
+    teams = cells.loc[cells.index.repeat(counts)].reset_index(drop=True)
+
+    codes = np.array(towns)[teams['town']]
+    names = pd.Series({code: f'{TOWN_NAMES.get(code, code)} Youth Soccer' for code in towns})
+    population = pd.Series(rng.integers(12_000, 40_000, len(towns)), index=towns)
+
+    games = np.where(rng.random(n_rows) < 0.9, 10, rng.integers(6, 12, n_rows))
+    wins = rng.binomial(games, 0.42)
+    ties = rng.binomial(games - wins, 0.15)
+    losses = games - wins - ties
+    goals_for = rng.poisson(np.maximum(2.0 * games + (wins - losses), 0))
+    goals_against = rng.poisson(np.maximum(2.0 * games - (wins - losses), 0))
+    division_level = rng.integers(1, 5, n_rows)
+    division_tier = np.array(list('ABCDEFGH'))[rng.integers(0, 8, n_rows)]
+
+    # Coaches come from a per-town pool so they recur across seasons
+    coach_id = teams['town'].to_numpy() * 40 + rng.integers(0, 40, n_rows)
+    first, last = np.array(FIRST_NAMES), np.array(LAST_NAMES)
+    head_coach = pd.Series(first[coach_id % len(first)]) + ' ' + \
+        pd.Series(last[(coach_id // len(first)) % len(last)]) + ' ' + pd.Series(codes)
+    assistant_coach = (pd.Series(first[rng.integers(0, len(first), n_rows)]) + ' ' +
+                       pd.Series(last[rng.integers(0, len(last), n_rows)])).where(rng.random(n_rows) < 0.85)
+
+    teams_df = pd.DataFrame({
+        'town_code': codes,
+        'town_name': names[codes].to_numpy(),
+        'town_population': population[codes].to_numpy(),
+        'season_year': teams['season_year'],
+        'season_period': teams['season_period'],
+        'team_name': pd.Series(np.array(MASCOTS)[rng.integers(0, len(MASCOTS), n_rows)]) + ' ' +
+            pd.Series(rng.integers(1, 100, n_rows)).astype(str),
+        'division_level': division_level,
+        'division_tier': division_tier,
+        'division_full': 'Division ' + pd.Series(division_level).astype(str) + division_tier,
+        'age_group': teams['age_group'],
+        'gender': teams['gender'],
+        'wins': wins,
+        'losses': losses,
+        'ties': ties,
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'goal_differential': goals_for - goals_against,
+        'points': 3 * wins + ties,
+        'final_rank': None,
+        'total_teams_in_division': None,
+        'head_coach': head_coach,
+        'assistant_coach': assistant_coach,
+        'scrape_date': '2026-01-10',
+    }, columns=TEAM_COLUMNS)
+
+    enrollment_df = pd.DataFrame({
+        'town_code': towns,
+        'town_name': [TOWN_NAMES.get(code, code) for code in towns],
+        'enrollment': rng.integers(1_500, 5_000, len(towns)),
+        'school_year': '2024-25',
+        'source_url': '',
+    })
+    return teams_df, enrollment_df
+
+
+def best_of(repeat, fn, *args):
+    """Result of fn(*args) and its fastest wall time in seconds over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def run_stages(teams_csv, enrollment_csv, repeat=3):
+    """Time every dashboard compute stage on one league; returns {stage: seconds}"""
+    stages = {}
+
+    def stage(name, fn, *args, runs=repeat):
+        result, stages[name] = best_of(runs, fn, *args)
+        return result
+
+    # Cold start: CSV -> validated typed store (what load_data triggers when the CSV changed)
+    stage('ingest', ingest_csv, teams_csv, runs=1)
+
+    # Dashboard data layer
+    def load_data():
+        return load_teams(teams_csv), pd.read_csv(enrollment_csv)
+    teams_df, enrollment_df = stage('load_data', load_data)
+    enrollment_map = dict(zip(enrollment_df['town_code'], enrollment_df['enrollment']))
+    towns = list(enrollment_df['town_code'])
+    town_names = {code: TOWN_NAMES.get(code, code) for code in towns}
+    years = sorted(teams_df['season_year'].unique().tolist())
+    periods = ('Fall', 'Spring')
+
+    cube = stage('build_cube', build_cube, teams_df)
+
+    def calculate_metrics():
+        return metrics_from_cube(select_cube(cube, years, periods), towns, enrollment_map, town_names)
+    metrics_df = stage('calculate_metrics', calculate_metrics)
+    ranks_df = stage('rank_metrics', rank_metrics, metrics_df)
+
+    def calculate_time_series():
+        return build_time_series_by_town(select_cube(cube, years, periods), towns, enrollment_map)
+    series_years, series_by_town = stage('time_series', calculate_time_series)
+
+    # Grades, findings and priority actions (Dashboard tab)
+    focus_town = towns[0]
+    stage('assessment', assess_town, metrics_df, ranks_df, series_years, series_by_town[focus_town],
+          focus_town, town_names[focus_town])
+
+    # Figures, built and serialized as st.plotly_chart does
+
+    def bar_charts():
+        return [build_bar_chart(metrics_df, metric, town_names[focus_town]).to_json() for metric in BAR_CHARTS]
+    stage('bar_charts', bar_charts)
+
+    def trend_charts():
+        return [build_trend_chart(section, series_years, series_by_town[focus_town], town_names[focus_town]).to_json()
+                for section in TREND_CHARTS]
+    stage('trend_charts', trend_charts)
+
+    # Appendix: heat-map Styler rendered to HTML (the cell styles st.dataframe extracts)
+    def appendix_styler():
+        return style_metrics_table(metrics_df.drop(columns=['Enrollment'])).to_html()
+    stage('appendix_styler', appendix_styler)
+
+    def team_records():
+        positions = team_order(teams_df, years, periods, towns, '', 'goal_differential', False)
+        return teams_df.iloc[positions[:25]]
+    stage('team_records', team_records)
+
+    team_index = stage('team_index', build_team_index, teams_df)
+    stage('drill_down', drill_down, team_index, focus_town, years[-1], 'Fall')
+
+    coach_index = stage('coach_index', build_coach_index, teams_df)
+
+    def coach_stats():
+        return coach_records(coach_index, years, periods), coach_retention(coach_index, years, periods, towns)
+    stage('coach_stats', coach_stats)
+
+    cohort_index = stage('cohort_index', build_cohort_index, teams_df)
+    stage('survival_curves', survival_curves, cohort_index, years, towns)
+
+    return {name: round(seconds, 6) for name, seconds in stages.items()}
+
+
+def run_benchmark(scales, repeat=3, workdir=None, seed=0):
+    """Generate and time one synthetic league per scale; returns the report document"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bays-benchmark-') as tmp:
+        workdir = workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        for scale in scales:
+            teams_df, enrollment_df = generate_league(scale, seed)
+            teams_csv = os.path.join(workdir, f'bays_teams_{scale}x.csv')
+            enrollment_csv = os.path.join(workdir, f'school_enrollment_{scale}x.csv')
+            teams_df.to_csv(teams_csv, index=False)
+            enrollment_df.to_csv(enrollment_csv, index=False)
+
+            towns, years, age_groups = league_shape(scale)
+            print(f'{scale}x: {len(teams_df):,} rows, {len(towns)} towns, {len(years)} years, '
+                  f'{len(age_groups)} age groups', file=sys.stderr)
+            results.append({
+                'scale': scale,
+                'rows': len(teams_df),
+                'towns': len(towns),
+                'years': len(years),
+                'age_groups': len(age_groups),
+                'stages': run_stages(teams_csv, enrollment_csv, repeat),
+            })
+
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def regressions(report, baseline, tolerance):
+    """(scale, stage, baseline seconds, seconds) for every stage slower than tolerance x baseline"""
+    before = {(result['scale'], name): seconds
+              for result in baseline['results'] for name, seconds in result['stages'].items()}
+    slower = []
+    for result in report['results']:
+        for name, seconds in result['stages'].items():
+            previous = before.get((result['scale'], name))
+            if previous is not None and seconds > previous * tolerance and seconds - previous > NOISE_FLOOR:
+                slower.append((result['scale'], name, previous, seconds))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the dashboard's compute stages on synthetic leagues")
+    parser.add_argument('--scales', nargs='+', type=int, default=DEFAULT_SCALES,
+                        help=f'League sizes as multiples of today\'s {BASE_ROWS:,} rows (default: 1 10 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage; the fastest is reported')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed')
+    parser.add_argument('--workdir', help='Keep the generated CSVs and stores here (default: a temp directory)')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    parser.add_argument('--baseline', help='Earlier JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Slowdown factor vs the baseline that counts as a regression')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.scales, args.repeat, args.workdir, args.seed)
+    document = json.dumps(report, indent=1)
+    print(document)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(document + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(report, json.load(f), args.tolerance)
+        for scale, name, previous, seconds in slower:
+            print(f'Regression at {scale}x: {name} {previous * 1000:.1f} ms -> {seconds * 1000:.1f} ms',
+                  file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Chart builders for the Foxboro Youth Soccer Analytics Dashboard.
+Every Plotly figure on the Dashboard and Trends Over Time tabs is described by
+a spec table here and built by one function, so the dashboard can memoize the
+finished figures on small hashable keys instead of rebuilding them per rerun.
+The Appendix metrics table's heat-map Styler, the grade and KPI cards and the
+Plotly config are defined here as well, shared with the static export.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from analytics import RANK_DIRECTIONS, heatmap_intensity
+
+# Plotly config to disable all interactions - make charts completely static
+PLOTLY_CONFIG = {
+    'displayModeBar': False,
+    'staticPlot': True,  # Makes the plot completely static - no interactions at all
+    'doubleClick': False,
+    'scrollZoom': False,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ['zoom2d', 'pan2d', 'select2d', 'lasso2d', 'zoomIn2d', 'zoomOut2d', 'autoScale2d', 'resetScale2d']
+}
+
+# Town bar charts (Dashboard tab). Bars are sorted best first using RANK_DIRECTIONS.
+# 'texttemplate' formats Plotly-side; 'text_format' pre-formats labels in Python (signed values)
+BAR_CHARTS = {
+    'Participation Rate': {'texttemplate': '%{text:.1f}', 'hovertemplate': '%{x}<br>%{y:.1f}<extra></extra>',
+                           'yaxis': dict(title='Teams per 100 Students')},
+    'Retention %': {'texttemplate': '%{text:.1f}%', 'hovertemplate': '%{x}<br>%{y:.1f}%<extra></extra>',
+                    'yaxis': dict(title='Retention %')},
+    'Growth %': {'text_format': '{:+.1f}%', 'hovertemplate': '%{x}<br>%{y:+.1f}%<extra></extra>',
+                 'yaxis': dict(title='Growth %'), 'hline': dict(y=0, line_dash="dash", line_color="black")},
+    'Win %': {'texttemplate': '%{text:.1f}%', 'hovertemplate': '%{x}<br>%{y:.1f}%<extra></extra>',
+              'yaxis': dict(range=[25, 70], title='Win %'), 'hline': dict(y=50, line_dash="dash", line_color="gray")},
+    'Goal Diff': {'text_format': '{:+.1f}', 'hovertemplate': '%{x}<br>%{y:+.1f}<extra></extra>',
+                  'yaxis': dict(title='Goal Diff'), 'hline': dict(y=0, line_dash="dash", line_color="black")},
+    'Goals For': {'texttemplate': '%{text:.1f}', 'hovertemplate': '%{x}<br>%{y:.1f}<extra></extra>',
+                  'yaxis': dict(title='Goals For')},
+    'Goals Against': {'texttemplate': '%{text:.1f}', 'hovertemplate': '%{x}<br>%{y:.1f}<extra></extra>',
+                      'yaxis': dict(title='Goals Against')},
+    'Gender Balance': {'texttemplate': '%{text:.1f}%', 'hovertemplate': '%{x}<br>%{y:.1f}%<extra></extra>',
+                       'yaxis': dict(range=[0, 100], title='% Girls (50% = Perfect)'),
+                       'hline': dict(y=50, line_dash="dash", line_color="gray")},
+    'Avg Division': {'texttemplate': '%{text:.1f}', 'hovertemplate': '%{x}<br>%{y:.1f}<extra></extra>',
+                     'yaxis': dict(title='Division (1=Highest, 4=Lowest)')},
+}
+
+# Trend sections (Trends Over Time tab): one subplot per (metric, title, hover format, line color)
+TREND_CHARTS = {
+    'participation': {
+        'rows': [('Participation Rate', 'Participation Rate (per 100 students)', '%{y:.1f}<extra></extra>', None),
+                 ('Retention %', 'Spring Retention Rate (%)', '%{y:.1f}%<extra></extra>', None),
+                 ('Growth %', 'Growth Rate (%)', '%{y:+.1f}%<extra></extra>', None)],
+        'color': 'rgba(230, 120, 50, 0.9)', 'height': 750, 'vertical_spacing': 0.12, 'legend_y': 1.05,
+    },
+    'competitive': {
+        'rows': [('Win %', 'Win % (%)', '%{y:.1f}%<extra></extra>', None),
+                 ('Goal Diff', 'Goal Differential (avg per team)', '%{y:+.1f}<extra></extra>', None),
+                 ('Goals For', 'Goals Scored (avg per team)', '%{y:.1f}<extra></extra>', None),
+                 # Light red to indicate higher is bad
+                 ('Goals Against', 'Goals Allowed (avg per team)', '%{y:.1f}<extra></extra>', 'rgba(255, 100, 100, 0.9)')],
+        'color': 'rgba(70, 130, 180, 0.9)', 'height': 900, 'vertical_spacing': 0.08, 'legend_y': 1.03,
+    },
+    'balance': {
+        'rows': [('Gender Balance', 'Gender Balance (% Girls)', '%{y:.1f}%<extra></extra>', None),
+                 ('Avg Division', 'Average Division Level', '%{y:.1f}<extra></extra>', None)],
+        'color': 'rgba(150, 100, 200, 0.9)', 'height': 550, 'vertical_spacing': 0.15, 'legend_y': 1.05,
+        # 50% reference line for gender balance; lower division is better, so that axis is reversed
+        'hlines': [dict(y=50, line_dash="dot", line_color="gray", opacity=0.5, row=1, col=1)],
+        'reversed_rows': [2],
+    },
+}
+
+
+def bar_colors(n_bars, focus_position):
+    """Gray bars with the focus town's bar (0-based position, or None) colored by its placing"""
+    colors = ['lightgray'] * n_bars
+    if focus_position is not None:
+        rank = focus_position + 1
+        if rank <= 2:
+            colors[focus_position] = 'green'  # Top 2
+        elif rank >= n_bars - 2:
+            colors[focus_position] = 'red'  # Bottom 3
+        else:
+            colors[focus_position] = 'gold'  # Middle
+    return colors
+
+
+def sort_best_first(metrics_df, metric):
+    """Towns ordered from best to worst on one metric"""
+    direction = RANK_DIRECTIONS[metric]
+    if direction == 'closest_to_50':
+        ordered = metrics_df.assign(distance_from_50=(metrics_df[metric] - 50).abs())
+        return ordered.sort_values('distance_from_50', ascending=True).reset_index(drop=True)
+    return metrics_df.sort_values(metric, ascending=direction == 'lower').reset_index(drop=True)
+
+
+def build_bar_chart(metrics_df, metric, focus_name):
+    """Bar chart of one metric across the towns in metrics_df, focus town highlighted"""
+    spec = BAR_CHARTS[metric]
+    ordered = sort_best_first(metrics_df, metric)
+    towns = ordered['Town'].tolist()
+    focus_position = towns.index(focus_name) if focus_name in towns else None
+
+    if 'text_format' in spec:
+        labels = dict(text=[spec['text_format'].format(val) for val in ordered[metric]])
+    else:
+        labels = dict(text=ordered[metric], texttemplate=spec['texttemplate'])
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=ordered['Town'],
+        y=ordered[metric],
+        marker_color=bar_colors(len(towns), focus_position),
+        textposition='outside',
+        hovertemplate=spec['hovertemplate'],
+        cliponaxis=False,
+        **labels
+    ))
+    fig.update_layout(dragmode=False,
+        height=350,
+        showlegend=False,
+        yaxis=spec['yaxis'],
+        xaxis=dict(title=''),
+        margin=dict(t=30, b=30, l=40, r=40),
+        font=dict(size=14)
+    )
+    if 'hline' in spec:
+        fig.add_hline(**spec['hline'])
+    return fig
+
+
+def build_trend_chart(section, years, time_series_data, focus_name):
+    """Stacked focus-town vs league-average line charts for one Trends section"""
+    spec = TREND_CHARTS[section]
+    rows = spec['rows']
+    fig = make_subplots(
+        rows=len(rows), cols=1,
+        subplot_titles=tuple(title for _, title, _, _ in rows),
+        vertical_spacing=spec['vertical_spacing']
+    )
+
+    for row, (metric, _, hovertemplate, color) in enumerate(rows, 1):
+        # Only the first subplot contributes legend entries
+        fig.add_trace(go.Scatter(x=years, y=time_series_data[metric]['Focus'],
+                                 name=focus_name, mode='lines+markers',
+                                 line=dict(color=color or spec['color'], width=3),
+                                 hovertemplate=hovertemplate,
+                                 showlegend=row == 1), row=row, col=1)
+        fig.add_trace(go.Scatter(x=years, y=time_series_data[metric]['Avg'],
+                                 name='League Avg', mode='lines+markers',
+                                 line=dict(color='lightgray', width=2, dash='dash'),
+                                 hovertemplate=hovertemplate,
+                                 showlegend=row == 1), row=row, col=1)
+    for hline in spec.get('hlines', []):
+        fig.add_hline(**hline)
+
+    fig.update_layout(dragmode=False,
+        height=spec['height'],
+        margin=dict(t=60, b=10, l=10, r=10),
+        font=dict(size=11),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=spec['legend_y'],
+            xanchor="center",
+            x=0.5
+        )
+    )
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=[2021, 2022, 2023, 2024, 2025],
+        ticktext=['2021', '2022', '2023', '2024', '2025']
+    )
+    for row in spec.get('reversed_rows', []):
+        fig.update_yaxes(autorange="reversed", row=row, col=1)
+    return fig
+
+
+# Cohort survival (Trends Over Time tab)
+SURVIVAL_CHART = {'color': 'rgba(46, 139, 87, 0.9)', 'height': 400,
+                  'hovertemplate': '%{y:.1f}%<extra></extra>'}
+
+
+def build_survival_chart(curves, focus_town, focus_name):
+    """Cohort survival by years since a cohort's first Fall: focus town vs the average of the other towns"""
+    spec = SURVIVAL_CHART
+    offsets = [int(k) for k in curves.columns]
+    focus = curves.loc[focus_town] if focus_town in curves.index else curves.mean() * float('nan')
+    peers = curves.drop(index=focus_town, errors='ignore').mean()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=offsets, y=focus.tolist(), name=focus_name, mode='lines+markers',
+                             line=dict(color=spec['color'], width=3), hovertemplate=spec['hovertemplate']))
+    fig.add_trace(go.Scatter(x=offsets, y=peers.tolist(), name='League Avg', mode='lines+markers',
+                             line=dict(color='lightgray', width=2, dash='dash'),
+                             hovertemplate=spec['hovertemplate']))
+    fig.add_hline(y=100, line_dash="dot", line_color="gray", opacity=0.5)
+
+    fig.update_layout(dragmode=False,
+        height=spec['height'],
+        margin=dict(t=60, b=10, l=10, r=10),
+        font=dict(size=11),
+        xaxis=dict(title="Years after the cohort's first Fall season", tickmode='array', tickvals=offsets),
+        yaxis=dict(title='% of first-season teams still fielded'),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.05,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    return fig
+
+
+# Appendix metrics table: value format per column
+METRICS_TABLE_FORMAT = {
+    'Win %': '{:.1f}',
+    'Goal Diff': '{:+.1f}',
+    'Participation Rate': '{:.1f}',
+    'Retention %': '{:.1f}',
+    'Goals For': '{:.1f}',
+    'Goals Against': '{:.1f}',
+    'Avg Division': '{:.1f}',
+    'Gender Balance': '{:.1f}',
+    'Growth %': '{:+.1f}',
+    'Enrollment': '{:.0f}'
+}
+
+
+def heatmap_styles(metrics_df):
+    """Background colors for the whole table from the vectorized heat-map intensities"""
+    intensity = heatmap_intensity(metrics_df)
+    magnitude = intensity.abs().astype(str)
+    styles = np.where(intensity > 0, 'background-color: rgba(0, 200, 0, ' + magnitude + ')',
+                      np.where(intensity < 0, 'background-color: rgba(255, 100, 100, ' + magnitude + ')', ''))
+    return pd.DataFrame(styles, index=intensity.index, columns=intensity.columns)
+
+
+def style_metrics_table(metrics_df):
+    """Formatted metrics table, green above each column's average and red below, scaled toward the best/worst town"""
+    styled = metrics_df.style.format({col: fmt for col, fmt in METRICS_TABLE_FORMAT.items() if col in metrics_df})
+    # Heat map on every ranked metric column at once
+    return styled.apply(heatmap_styles, axis=None, subset=list(RANK_DIRECTIONS))
+
+
+# Assessment categories (GRADE_CATEGORIES) as headed on the Trends Over Time and KPI Summary tabs
+CATEGORY_ICONS = {'Participation & Growth': '👥', 'Competitive Performance': '🏆', 'Program Balance': '⚖️'}
+
+GRADE_COLORS = {
+    'A': "#28a745",  # Green
+    'B': "#5cb85c",  # Light green
+    'C': "#ffc107",  # Yellow/Gold
+    'D': "#fd7e14",  # Orange
+    'F': "#dc3545",  # Red
+}
+
+
+def grade_card(category, grade):
+    """Letter grade box (Dashboard tab) as HTML"""
+    color = GRADE_COLORS[grade]
+    return f"""
+            <div style='border: 3px solid {color}; padding: 6px; border-radius: 10px; text-align: center; background-color: rgba{tuple(list(bytes.fromhex(color[1:])) + [0.1])};'>
+                <h4 style='margin: 0; margin-bottom: 1px; font-size: 14px;'>{category}</h4>
+                <h1 style='margin: 0; color: {color}; font-size: 48px; font-weight: bold;'>{grade}</h1>
+            </div>
+            """
+
+
+# KPI Summary cards per category: (metric, label, value format, note under the value)
+KPI_CARDS = {
+    'Participation & Growth': [
+        ('Participation Rate', 'Participation Rate', '{:.1f}', 'per 100 students'),
+        ('Retention %', 'Spring Retention', '{:.1f}%', None),
+        ('Growth %', 'Growth', '{:+.1f}%', None),
+    ],
+    'Competitive Performance': [
+        ('Win %', 'Win %', '{:.1f}%', None),
+        ('Goal Diff', 'Goal Differential', '{:+.1f}', 'avg per team'),
+        ('Goals For', 'Goals Scored', '{:.1f}', 'avg per team'),
+        ('Goals Against', 'Goals Allowed', '{:.1f}', 'avg per team'),
+    ],
+    'Program Balance': [
+        ('Gender Balance', '% Girls', '{:.1f}%', None),
+        ('Avg Division', 'Avg Division', '{:.1f}', None),
+    ],
+}
+
+
+def rank_color(rank):
+    """Green for the top 2 of 8 towns, orange for the middle, red for the bottom 3"""
+    if rank <= 2:
+        return "green"
+    elif rank <= 5:
+        return "orange"
+    else:
+        return "red"
+
+
+def kpi_card(label, rank, value, note=None):
+    """One KPI Summary card as HTML: label, rank and formatted value"""
+    note_html = f"""
+            <p style='margin: 0; font-size: 10px; color: gray;'>{note}</p>""" if note else ""
+    return f"""<div style='border: 1px solid #d3d3d3; padding: 8px; border-radius: 5px;'>
+            <p style='margin-bottom: 0px;'><strong>{label} <span style='color: {rank_color(rank)};'>#{rank}</span></strong></p>
+            <h2 style='margin-top: 0; margin-bottom: 0;'>{value}</h2>{note_html}
+            </div>"""
+
+
+# Tab layouts shared by the dashboard and the static export (export.py). Both renderers iterate
+# these tables, so a heading or message edited here changes every copy of the view.
+
+# Dashboard tab town bar charts: (section heading, rows of (chart heading, metric)); a row with one
+# chart spans the full width. {first}/{last} are the selected years.
+DASHBOARD_SECTIONS = [
+    ('🎉 Are Kids Participating and Having Fun?', [
+        [('📈 Participation Rate (Teams per 100 Students)', 'Participation Rate'),
+         ('🔄 Spring Retention Rate', 'Retention %')],
+        [('📊 Growth Rate ({first} → {last})', 'Growth %')],
+    ]),
+    ('🏆 Is the Program Competitive? Are Kids Learning Soccer?', [
+        [('🏅 Win Percentage by Town', 'Win %')],
+        [('⚡ Goal Differential (Avg per Team)', 'Goal Diff'), ('⚽ Goals Scored (Avg per Team)', 'Goals For'),
+         ('🛡️ Goals Allowed (Avg per Team)', 'Goals Against')],
+    ]),
+    ('⚖️ Program Structure & Balance', [
+        [('⚖️ Gender Balance (% Girls)', 'Gender Balance'), ('🏅 Competitive Level (Avg Division)', 'Avg Division')],
+    ]),
+]
+
+# Notes under a Dashboard chart: metric -> (Assessment flag that shows the note, note HTML)
+CHART_NOTES = {
+    'Gender Balance': ('gender_balance_declining',
+                       "⚠️ <em>Note: {focus_name}'s gender balance percentage is decreasing over time. "
+                       "See Trends Over Time tab for details.</em>"),
+}
+
+# Key Findings columns: (Assessment field, heading, empty-state kind ('success' or 'info'), empty-state text)
+FINDINGS_SECTIONS = [
+    ('concerns', '⚠️ Areas Needing Attention', 'success',
+     "✅ No major concerns identified. Program is performing well across key metrics."),
+    ('strengths', '✅ Strengths & Positive Indicators', 'info',
+     "💡 Building program strengths should be a focus area. Current performance provides opportunities for "
+     "improvement across multiple metrics."),
+]
+FINDINGS_SHOWN = 3
+
+# Trends Over Time sections: (trend chart section, GRADE_CATEGORIES category, background, heading color),
+# then the cohort survival section as (heading, background, heading color)
+TREND_SECTIONS = [
+    ('participation', 'Participation & Growth', 'rgba(255, 200, 150, 0.3)', 'rgba(230, 120, 50, 1)'),
+    ('competitive', 'Competitive Performance', 'rgba(173, 216, 230, 0.3)', 'rgba(70, 130, 180, 1)'),
+    ('balance', 'Program Balance', 'rgba(200, 180, 230, 0.2)', 'rgba(150, 100, 200, 1)'),
+]
+COHORT_SECTION = ('👣 Cohort Survival', 'rgba(144, 238, 144, 0.2)', 'rgba(46, 139, 87, 1)')
+
+# Headings, captions, empty states and footnotes; {placeholders} are filled with str.format
+TAB_TEXT = {
+    'assessment': "📊 Overall Program Assessment",
+    'findings': "🔍 Key Findings & Recommendations",
+    'ai_generated': "(AI Generated)",
+    'priorities': "📋 Priority Action Items",
+    'trends': "📈 Performance Trends Over Time",
+    'trends_caption': "{focus_name} vs League Average (7 Comparable Towns)",
+    'key_trends': "📊 Key Trends ({first}–{last})",
+    'cohort_caption': "Each Fall team belongs to a cohort (town, gender and class year). The chart follows every "
+                      "cohort from its first Fall season in the selected years and shows how many teams it still "
+                      "fields as it moves up the grades.",
+    'cohort_single_year': "Select at least two years to follow cohorts across seasons.",
+    'cohort_table': "{focus_name} cohorts: Fall teams by season",
+    'kpi': "📊 KPI Summary — {focus_name} vs Peers",
+    'kpi_caption': "{focus_name}'s rank out of 8 comparable towns across key performance indicators",
+    'kpi_footnote': "Rankings are out of 8 towns. <span style='color: green;'>Green</span> = Top 2, "
+                    "<span style='color: orange;'>Orange</span> = Middle, <span style='color: red;'>Red</span> = "
+                    "Bottom 3.",
+    'coaches': "👥 Coach Continuity — {focus_name} vs Peers",
+    'coaches_caption': "Do towns that keep their head coaches from Fall to Spring also keep their teams?",
+    'head_coaches': "{focus_name} Head Coaches",
+    'head_coaches_footnote': "{count} head coaches. Seasons counts Fall and Spring separately; Win % counts ties as "
+                             "half a win.",
+    'appendix': "📋 Appendix",
+    'metrics_table': "📊 Complete Metrics Table",
+}
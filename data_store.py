@@ -0,0 +1,166 @@
+"""
+Typed columnar store for the BAYS team data.
+data/bays_teams.csv stays the source of truth; the dashboard reads a typed
+Arrow/Feather copy next to it (categorical strings, compact integers) that is
+memory-mapped on load and regenerated automatically whenever the CSV changes.
+The store only ever holds rows that passed validation in ingest.py.
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+TEAMS_CSV = 'data/bays_teams.csv'
+ENROLLMENT_CSV = 'data/school_enrollment.csv'
+
+# Column dtypes for bays_teams.csv (nullable integers for the optional columns)
+TEAM_DTYPES = {
+    'town_code': 'category',
+    'town_name': 'str',
+    'town_population': 'Int32',
+    'season_year': 'int16',
+    'season_period': 'category',
+    'team_name': 'str',
+    'division_level': 'int8',
+    'division_tier': 'str',
+    'division_full': 'category',
+    'age_group': 'category',
+    'gender': 'category',
+    'wins': 'int16',
+    'losses': 'int16',
+    'ties': 'int16',
+    'goals_for': 'int16',
+    'goals_against': 'int16',
+    'goal_differential': 'int16',
+    'points': 'int16',
+    'final_rank': 'Int16',
+    'total_teams_in_division': 'Int16',
+    'head_coach': 'str',
+    'assistant_coach': 'str',
+    'scrape_date': 'str',
+}
+
+# bays_teams.csv column order
+TEAM_COLUMNS = list(TEAM_DTYPES)
+CATEGORY_COLUMNS = [name for name, dtype in TEAM_DTYPES.items() if dtype == 'category']
+NULLABLE_DTYPES = {name: dtype for name, dtype in TEAM_DTYPES.items() if dtype.startswith('Int')}
+
+# Arrow schema of the store. Categorical columns are stored as plain strings so
+# chunks can be streamed in without unifying dictionaries; read_store encodes them.
+_ARROW_TYPES = {'category': pa.string(), 'str': pa.string(), 'Int32': pa.int32(), 'Int16': pa.int16(),
+                'int16': pa.int16(), 'int8': pa.int8()}
+STORE_SCHEMA = pa.schema([(name, _ARROW_TYPES[dtype]) for name, dtype in TEAM_DTYPES.items()])
+
+# Schema metadata keys recording which CSV the store was built from
+_META_SIZE = b'source_size'
+_META_MTIME = b'source_mtime_ns'
+_META_SHA256 = b'source_sha256'
+
+
+def store_path(csv_path):
+    """Path of the typed store that shadows a CSV file"""
+    return os.path.splitext(csv_path)[0] + '.feather'
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def data_version(paths=(TEAMS_CSV, ENROLLMENT_CSV)):
+    """Cheap fingerprint of the source files (size + mtime) used to key every cached computation"""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()[:16]
+
+
+def _store_is_fresh(csv_path, path):
+    """True when the store was built from the current CSV (mtime/size, falling back to content hash)"""
+    if not os.path.exists(path):
+        return False
+    try:
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+
+    stat = os.stat(csv_path)
+    if (metadata.get(_META_SIZE) == str(stat.st_size).encode() and
+            metadata.get(_META_MTIME) == str(stat.st_mtime_ns).encode()):
+        return True
+    # Touched but not edited (e.g. a fresh checkout) - the contents decide
+    return metadata.get(_META_SHA256) == file_sha256(csv_path).encode()
+
+
+class StoreWriter:
+    """Stream record batches into the store; the file only replaces the old store on a clean exit.
+
+    The store is stamped with the source CSV's fingerprint taken before any rows are read,
+    so a CSV edited mid-ingest leaves the store stale and it is rebuilt on the next load.
+    """
+
+    def __init__(self, csv_path, path=None):
+        self.path = path or store_path(csv_path)
+        stat = os.stat(csv_path)
+        self.schema = STORE_SCHEMA.with_metadata({
+            _META_SIZE: str(stat.st_size),
+            _META_MTIME: str(stat.st_mtime_ns),
+            _META_SHA256: file_sha256(csv_path),
+        })
+        self._tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        self._writer = None
+
+    def __enter__(self):
+        # Uncompressed Arrow IPC (Feather v2) so readers can memory-map it
+        self._writer = pa.ipc.new_file(self._tmp_path, self.schema,
+                                       options=pa.ipc.IpcWriteOptions(compression=None))
+        return self
+
+    def write(self, teams_df):
+        """Append a typed team frame (categorical columns may be plain strings)"""
+        self._writer.write_table(pa.Table.from_pandas(teams_df, schema=STORE_SCHEMA, preserve_index=False))
+
+    def __exit__(self, exc_type, exc, tb):
+        self._writer.close()
+        if exc_type is None:
+            # Write-then-rename so concurrent worker processes never see a half-written file
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+        return False
+
+
+def read_store(path):
+    """Memory-map the store and convert it to the typed team frame"""
+    table = feather.read_table(path, memory_map=True)
+    for name in CATEGORY_COLUMNS:
+        index = table.schema.get_field_index(name)
+        if not pa.types.is_dictionary(table.schema.field(index).type):
+            table = table.set_column(index, name, table.column(name).dictionary_encode())
+    # Arrow hands back integer columns with nulls as float64; restore the nullable dtypes
+    return table.to_pandas().astype(NULLABLE_DTYPES)
+
+
+def load_teams(csv_path=TEAMS_CSV):
+    """Load the typed team frame, re-ingesting the CSV if the store is missing or stale"""
+    # Imported here: ingest builds on the schema and writer defined in this module
+    from ingest import ingest_csv, validate_chunk
+
+    path = store_path(csv_path)
+    if not _store_is_fresh(csv_path, path):
+        try:
+            ingest_csv(csv_path, path)
+        except OSError:
+            # Read-only filesystem: validate in memory and serve without caching, with the store's dtypes
+            teams = validate_chunk(pd.read_csv(csv_path, dtype=str, keep_default_na=False)).teams
+            return teams.astype(TEAM_DTYPES)
+    return read_store(path)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Static report export.
+Pre-renders the Dashboard, Trends Over Time, KPI Summary and Appendix views for
+chosen year ranges and focus towns as plain HTML pages that any static file
+server or CDN can host without a Streamlit process behind it. Figures are
+embedded as Plotly JSON and drawn by one shared copy of plotly.js, tables are
+pre-rendered HTML, and with --png every chart is also written as an image
+(requires kaleido). Each page is one job in a process pool; a worker loads the
+team data once and computes each year range's selection once.
+
+    python export.py                                          # every year range, Foxboro, into site/
+    python export.py --years 2021-2025 2024-2025 --towns FOX HOP --workers 4
+    python export.py --years 2021-2025 --png
+"""
+
+import argparse
+import functools
+import html
+import importlib.util
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from analytics import (TOWN_NAMES, assess_town, build_cohort_index, build_cube, build_team_index,
+                       build_time_series_by_town, cohort_table, drill_down, key_trends, metrics_from_cube,
+                       rank_metrics, select_cube, survival_curves, team_table)
+from charts import (CATEGORY_ICONS, CHART_NOTES, COHORT_SECTION, DASHBOARD_SECTIONS, FINDINGS_SECTIONS, FINDINGS_SHOWN,
+                    KPI_CARDS, PLOTLY_CONFIG, TAB_TEXT, TREND_SECTIONS, build_bar_chart, build_survival_chart,
+                    build_trend_chart, grade_card, kpi_card, style_metrics_table)
+from data_store import ENROLLMENT_CSV, TEAMS_CSV, data_version, load_teams
+from snapshot import SNAPSHOT_PERIODS, year_ranges
+
+OUTPUT_DIR = 'site'
+LOGO_PATH = 'fox-logo_3.png'
+
+TOWNS = list(TOWN_NAMES)
+
+# Exported views: page name -> tab label
+VIEWS = {
+    'dashboard': '📊 Dashboard',
+    'trends': '📈 Trends Over Time',
+    'kpi': '📊 KPI Summary',
+    'appendix': '📋 Appendix',
+}
+
+TEAM_TABLE_FORMAT = {'GD': '{:+d}', 'Final Rank': '{:.0f}'}
+
+REPORT_CSS = """
+body { font-family: "Source Sans Pro", -apple-system, "Segoe UI", Roboto, sans-serif; color: #31333f;
+       max-width: 1200px; margin: 0 auto; padding: 0 24px 40px; }
+header { display: flex; align-items: center; gap: 16px; }
+header h1 { margin: 0; }
+nav { display: flex; flex-wrap: wrap; gap: 4px 20px; border-bottom: 1px solid #e6e6e6; padding: 8px 0; margin-bottom: 16px; }
+nav a { color: #31333f; text-decoration: none; padding-bottom: 6px; }
+nav a.active { color: #ff4b4b; border-bottom: 2px solid #ff4b4b; }
+.caption { color: #808080; font-size: 14px; margin: 0 0 10px 96px; }
+.row { display: grid; grid-template-columns: repeat(auto-fit, minmax(260px, 1fr)); gap: 16px; margin-bottom: 16px; }
+details { border: 1px solid #e6e6e6; border-radius: 8px; padding: 8px 12px; margin-bottom: 10px; }
+summary { cursor: pointer; font-weight: 600; }
+table { border-collapse: collapse; font-size: 13px; width: 100%; }
+th, td { border-bottom: 1px solid #e6e6e6; padding: 4px 8px; text-align: right; white-space: nowrap; }
+th:first-child, td:first-child { text-align: left; }
+.table-wrap { overflow-x: auto; }
+.note { color: gray; font-size: 12px; }
+.info { background: #e8f1fb; border-radius: 8px; padding: 12px 16px; }
+.success { background: #e6f4ea; border-radius: 8px; padding: 12px 16px; }
+footer { color: #808080; font-size: 12px; margin-top: 32px; border-top: 1px solid #e6e6e6; padding-top: 8px; }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{root}assets/report.css">
+<script src="{root}assets/plotly.min.js"></script>
+</head>
+<body>
+<header><img src="{root}assets/{logo}" alt="" width="80"><h1>Foxboro Youth Soccer Analytics</h1></header>
+{caption}
+<nav>{nav}</nav>
+<main>
+{body}
+</main>
+<footer>Static export of data version {version}. Seasons: Fall &amp; Spring (both included).</footer>
+</body>
+</html>
+"""
+
+
+class League(NamedTuple):
+    cube: pd.DataFrame
+    enrollment_map: dict
+    years: list
+    team_index: pd.DataFrame
+    cohort_index: pd.DataFrame
+
+
+class Selection(NamedTuple):
+    metrics_df: pd.DataFrame
+    ranks_df: pd.DataFrame
+    years: list
+    time_series_by_town: dict
+
+
+class ExportJob(NamedTuple):
+    view: str
+    year_range: tuple
+    town: str
+    output_dir: str
+    version: str
+    png: bool
+
+
+# Per-worker data: the league is loaded once per process, each year range computed once per process
+@functools.lru_cache(maxsize=1)
+def load_league(teams_csv=TEAMS_CSV, enrollment_csv=ENROLLMENT_CSV):
+    teams_df = load_teams(teams_csv)
+    enrollment_df = pd.read_csv(enrollment_csv)
+    cube = build_cube(teams_df)
+    years = sorted(int(year) for year in cube.index.get_level_values('season_year').unique())
+    return League(cube, dict(zip(enrollment_df['town_code'], enrollment_df['enrollment'])), years,
+                  build_team_index(teams_df), build_cohort_index(teams_df))
+
+
+@functools.lru_cache(maxsize=8)
+def selection(year_range):
+    """Metrics, ranks and trend series of every town for an inclusive year range (as the dashboard computes them)"""
+    league = load_league()
+    cube_slice = select_cube(league.cube, range(year_range[0], year_range[1] + 1), SNAPSHOT_PERIODS)
+    metrics_df = metrics_from_cube(cube_slice, TOWNS, league.enrollment_map, TOWN_NAMES)
+    years, time_series_by_town = build_time_series_by_town(cube_slice, TOWNS, league.enrollment_map)
+    return Selection(metrics_df, rank_metrics(metrics_df), years, time_series_by_town)
+
+
+# HTML helpers
+def escape(text):
+    """HTML-escape text, keeping **bold** as <strong>"""
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(text, quote=False))
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def years_text(year_range):
+    first, last = year_range
+    return f"{first}" if first == last else f"{first} - {last}"
+
+
+def page_path(town, year_range, view):
+    """Page location relative to the output directory"""
+    return f"{town}/{year_range[0]}-{year_range[1]}/{view}.html"
+
+
+class Page:
+    """Body HTML of one view plus the figures it embeds"""
+
+    def __init__(self):
+        self.parts = []
+        self.figures = []
+
+    def add(self, *parts):
+        self.parts.extend(parts)
+
+    def chart(self, name, fig):
+        self.figures.append((name, fig))
+        return pio.to_html(fig, full_html=False, include_plotlyjs=False, config=PLOTLY_CONFIG,
+                           div_id=f"chart-{name}", default_height=f"{fig.layout.height or 450}px")
+
+    def row(self, *cells):
+        self.add("<div class='row'>" + "".join(f"<div>{cell}</div>" for cell in cells) + "</div>")
+
+    def html(self):
+        return "\n".join(self.parts)
+
+
+# Views: each renders one tab for a focus town and year range into a Page
+def dashboard_view(page, year_range, town):
+    metrics_df, ranks_df, years, time_series_by_town = selection(year_range)
+    focus_name = TOWN_NAMES[town]
+    assessment = assess_town(metrics_df, ranks_df, years, time_series_by_town[town], town, focus_name)
+
+    page.add(f"<h2>{TAB_TEXT['assessment']}</h2>")
+    page.row(*(grade_card(category, grade) for category, grade in assessment.grades.items()))
+
+    for heading, rows in DASHBOARD_SECTIONS:
+        page.add("<hr>", f"<h2>{escape(heading)}</h2>")
+        for charts in rows:
+            cells = []
+            for chart_heading, metric in charts:
+                fig = build_bar_chart(metrics_df, metric, focus_name)
+                cell = f"<h3>{chart_heading.format(first=year_range[0], last=year_range[1])}</h3>"
+                cell += page.chart(slug(metric), fig)
+                flag, note = CHART_NOTES.get(metric, (None, None))
+                if flag and getattr(assessment, flag):
+                    cell += f"<p style='color: #808080; font-size: 14px;'>{note.format(focus_name=focus_name)}</p>"
+                cells.append(cell)
+            page.row(*cells)
+
+    page.add("<hr>", f"<h2>{escape(TAB_TEXT['findings'])}</h2>",
+             f"<p style='color: grey; font-size: 0.9em;'>{TAB_TEXT['ai_generated']}</p>")
+    findings = []
+    for field, heading, empty_kind, empty_text in FINDINGS_SECTIONS:
+        cell = f"<h3>{escape(heading)}</h3>"
+        cell += "".join(f"<details open><summary>{escape(item['title'])}</summary><p>{escape(item['detail'])}</p></details>"
+                        for item in getattr(assessment, field)[:FINDINGS_SHOWN]) \
+            or f"<div class='{empty_kind}'>{empty_text}</div>"
+        findings.append(cell)
+    page.row(*findings)
+
+    page.add("<hr>", f"<h3>{TAB_TEXT['priorities']}</h3>",
+             f"<p style='color: grey; font-size: 0.9em;'>{TAB_TEXT['ai_generated']}</p>",
+             "<ol>" + "".join(f"<li><strong>{timeframe}:</strong> {escape(action)}</li>"
+                              for timeframe, action in assessment.priorities) + "</ol>")
+
+
+def trends_view(page, year_range, town):
+    _, _, years, time_series_by_town = selection(year_range)
+    time_series_data = time_series_by_town[town]
+    focus_name = TOWN_NAMES[town]
+    league = load_league()
+
+    page.add(f"<h2>{TAB_TEXT['trends']}</h2>",
+             f"<p style='color: gray; font-size: 14px;'>{TAB_TEXT['trends_caption'].format(focus_name=focus_name)}</p>")
+
+    if len(years) >= 2:
+        page.add("<hr>", f"<h3>{TAB_TEXT['key_trends'].format(first=min(years), last=max(years))}</h3>",
+                 f"<p style='color: grey; font-size: 0.85em; margin-top: 0;'>{TAB_TEXT['ai_generated']}</p>")
+        page.row(*(f"<strong>{CATEGORY_ICONS[category]} {category}</strong>"
+                   + "<ul>" + "".join(f"<li>{bullet}</li>" for bullet in bullets) + "</ul>"
+                   for category, bullets in key_trends(time_series_data).items()))
+        page.add("<hr>")
+
+    for section, category, background, color in TREND_SECTIONS:
+        fig = build_trend_chart(section, years, time_series_data, focus_name)
+        page.add(f"<div style='background-color: {background}; padding: 15px; border-radius: 8px; margin-bottom: 15px;'>",
+                 f"<h3 style='margin-top: 0; color: {color};'>{CATEGORY_ICONS[category]} {category}</h3>",
+                 page.chart(f"trend-{section}", fig), "</div>")
+
+    cohort_heading, background, color = COHORT_SECTION
+    page.add(f"<div style='background-color: {background}; padding: 15px; border-radius: 8px; margin-bottom: 15px;'>",
+             f"<h3 style='margin-top: 0; color: {color};'>{cohort_heading}</h3>",
+             f"<p style='color: gray; font-size: 14px;'>{TAB_TEXT['cohort_caption']}</p>")
+    selected_years = list(range(year_range[0], year_range[1] + 1))
+    if year_range[1] > year_range[0]:
+        curves = survival_curves(league.cohort_index, selected_years, TOWNS)
+        page.add(page.chart('cohort-survival', build_survival_chart(curves, town, focus_name)))
+    else:
+        page.add(f"<div class='info'>{TAB_TEXT['cohort_single_year']}</div>")
+    cohorts_df = cohort_table(league.cohort_index, town, selected_years)
+    cohorts_df.index = [f"Class of {class_of} {gender}" for class_of, gender in cohorts_df.index]
+    page.add(f"<details><summary>{TAB_TEXT['cohort_table'].format(focus_name=focus_name)}</summary><div class='table-wrap'>",
+             cohorts_df.style.format('{:g}', na_rep='').set_uuid('cohorts').to_html(), "</div></details>", "</div>")
+
+
+def kpi_view(page, year_range, town):
+    metrics_df, ranks_df, _, _ = selection(year_range)
+    focus_name = TOWN_NAMES[town]
+    kpi_focus = metrics_df.loc[town]
+    focus_ranks = ranks_df.loc[town]
+
+    page.add(f"<h2>{TAB_TEXT['kpi'].format(focus_name=focus_name)}</h2>",
+             f"<p style='color: gray; font-size: 14px;'>{TAB_TEXT['kpi_caption'].format(focus_name=focus_name)}</p>")
+    for category, cards in KPI_CARDS.items():
+        page.add(f"<h3>{CATEGORY_ICONS[category]} {category}</h3>")
+        page.row(*(kpi_card(label, focus_ranks[metric], fmt.format(kpi_focus[metric]), note)
+                   for metric, label, fmt, note in cards))
+    page.add("<hr>", f"<p class='note'>{TAB_TEXT['kpi_footnote']}</p>")
+
+
+def appendix_view(page, year_range, town):
+    metrics_df = selection(year_range).metrics_df
+    league = load_league()
+    focus_name = TOWN_NAMES[town]
+
+    page.add(f"<h2>{TAB_TEXT['appendix']}</h2>", f"<h3>{TAB_TEXT['metrics_table']}</h3>")
+    display_df = metrics_df.dropna(how='all').drop(columns=['Enrollment'])
+    page.add("<div class='table-wrap'>", style_metrics_table(display_df).set_uuid('metrics').to_html(), "</div>")
+
+    # Team records of the focus town, one season per section (newest first), as in the Team Drill-Down
+    page.add("<hr>", f"<h3>🗂️ {focus_name} Team Records</h3>")
+    for year in reversed(range(year_range[0], year_range[1] + 1)):
+        for period in SNAPSHOT_PERIODS:
+            season_teams = drill_down(league.team_index, town, year, period)
+            if season_teams.empty:
+                continue
+            wins, losses, ties = (int(season_teams[col].sum()) for col in ['wins', 'losses', 'ties'])
+            table = team_table(season_teams.reset_index()).drop(columns=['Town', 'Year', 'Season'])
+            styled = table.style.format(TEAM_TABLE_FORMAT, na_rep='').hide(axis='index')
+            page.add(f"<details><summary>{period} {year}: {len(season_teams)} teams, {wins}-{losses}-{ties} "
+                     f"combined record</summary><div class='table-wrap'>",
+                     styled.set_uuid(f"teams-{year}-{period.lower()}").to_html(), "</div></details>")
+
+
+VIEW_RENDERERS = {'dashboard': dashboard_view, 'trends': trends_view, 'kpi': kpi_view, 'appendix': appendix_view}
+
+
+def nav_html(town, year_range, active, root):
+    links = [f"<a href='{root}index.html'>All reports</a>"]
+    for view, label in VIEWS.items():
+        css = " class='active'" if view == active else ""
+        links.append(f"<a href='{root}{page_path(town, year_range, view)}'{css}>{label}</a>")
+    return "".join(links)
+
+
+def export_view(job):
+    """Render one view to HTML (and its charts to PNG); returns (page path, bytes written, images, seconds)"""
+    started = time.perf_counter()
+    page = Page()
+    VIEW_RENDERERS[job.view](page, job.year_range, job.town)
+
+    path = page_path(job.town, job.year_range, job.view)
+    root = '../' * path.count('/')
+    document = PAGE.format(
+        title=f"{VIEWS[job.view]} — {TOWN_NAMES[job.town]}, {years_text(job.year_range)}",
+        root=root, logo=os.path.basename(LOGO_PATH), version=job.version,
+        caption=f"<p class='caption'>Analysis Period: {years_text(job.year_range)} · Focus: {TOWN_NAMES[job.town]}</p>",
+        nav=nav_html(job.town, job.year_range, job.view, root), body=page.html())
+    target = os.path.join(job.output_dir, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(document)
+
+    if job.png:
+        for name, fig in page.figures:
+            fig.write_image(os.path.join(os.path.dirname(target), f"{job.view}-{name}.png"),
+                            width=1200, height=fig.layout.height or 450)
+    return path, len(document.encode('utf-8')), len(page.figures) if job.png else 0, time.perf_counter() - started
+
+
+def index_html(towns, ranges, version):
+    rows = []
+    for town in towns:
+        rows.append(f"<h2>{TOWN_NAMES[town]}</h2>")
+        rows.append("<table><tr><th>Years</th>" + "".join(f"<th>{label}</th>" for label in VIEWS.values()) + "</tr>")
+        for year_range in ranges:
+            cells = "".join(f"<td><a href='{page_path(town, year_range, view)}'>{label}</a></td>"
+                            for view, label in VIEWS.items())
+            rows.append(f"<tr><td>{years_text(year_range)}</td>{cells}</tr>")
+        rows.append("</table>")
+    return PAGE.format(title="Foxboro Youth Soccer Analytics — Reports", root='', logo=os.path.basename(LOGO_PATH),
+                       version=version, caption='', nav='', body="\n".join(rows))
+
+
+def write_assets(output_dir):
+    """Shared files every page references: plotly.js (written once instead of inlined per page), CSS and logo"""
+    assets = os.path.join(output_dir, 'assets')
+    os.makedirs(assets, exist_ok=True)
+    with open(os.path.join(assets, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    with open(os.path.join(assets, 'report.css'), 'w', encoding='utf-8') as f:
+        f.write(REPORT_CSS.lstrip())
+    if os.path.exists(LOGO_PATH):
+        shutil.copyfile(LOGO_PATH, os.path.join(assets, os.path.basename(LOGO_PATH)))
+
+
+def parse_year_range(text):
+    first, _, last = text.partition('-')
+    try:
+        return int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YEAR or FIRST-LAST, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the dashboard views as a static HTML site')
+    parser.add_argument('--years', nargs='+', type=parse_year_range, metavar='FIRST-LAST',
+                        help='year ranges to export (default: every range the year slider can select)')
+    parser.add_argument('--towns', nargs='+', default=['FOX'], type=str.upper, choices=TOWNS, metavar='TOWN',
+                        help='focus towns (default: FOX)')
+    parser.add_argument('--views', nargs='+', default=list(VIEWS), choices=list(VIEWS), help='views to export')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'output directory (default: {OUTPUT_DIR})')
+    parser.add_argument('--png', action='store_true', help='also write every chart as a PNG (requires kaleido)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    if args.png and importlib.util.find_spec('kaleido') is None:
+        parser.error('--png needs kaleido to render images: pip install kaleido')
+
+    league_years = load_league().years
+    ranges = args.years or year_ranges(league_years)
+    for first, last in ranges:
+        if not league_years[0] <= first <= last <= league_years[-1]:
+            parser.error(f"year range {first}-{last} is outside the data ({league_years[0]}-{league_years[-1]})")
+
+    version = data_version()
+    write_assets(args.output)
+    # Jobs of one year range are adjacent, so a worker usually reuses the selection it just computed
+    jobs = [ExportJob(view, year_range, town, args.output, version, args.png)
+            for year_range in ranges for town in args.towns for view in args.views]
+
+    started = time.perf_counter()
+    total_bytes = total_images = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(export_view, job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            # One failing view is reported and the rest of the site is still written
+            try:
+                path, n_bytes, n_images, seconds = future.result()
+            except Exception as error:
+                failed += 1
+                print(f"Failed {page_path(job.town, job.year_range, job.view)}: {error!r}", file=sys.stderr)
+                continue
+            total_bytes += n_bytes
+            total_images += n_images
+            print(f"{path:<36} {n_bytes / 1024:8.0f} KiB {seconds * 1000:8.0f} ms")
+
+    with open(os.path.join(args.output, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(index_html(args.towns, ranges, version))
+    summary = f"{len(jobs) - failed} pages ({total_bytes / 1024 ** 2:.1f} MiB)"
+    if args.png:
+        summary += f" and {total_images} images"
+    if failed:
+        summary += f" ({failed} failed)"
+    print(f"Wrote {summary} to {args.output}/ in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
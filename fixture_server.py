@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Local fixture server for the BAYS scraper.
+Replays saved standings pages from fixtures/standings/ at the same paths the
+scraper requests on the live site, so scraping can be tested and benchmarked
+offline. HTTP/1.1 keep-alive is supported so connection reuse is exercised, and
+pages carry ETag/Last-Modified validators (answering conditional requests with
+304) so incremental scrapes can be tested too.
+
+    python fixture_server.py --port 8765 --delay 0.05
+    python fixture_server.py --save-from-csv --towns FOX ASH   # regenerate saved pages
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import re
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'standings')
+
+# Mirrors bays_scraper.STANDINGS_PATH
+PATH_PATTERN = re.compile(r'^/standings/(?P<town>[A-Z]{3})/(?P<year>\d{4})/(?P<period>Fall|Spring)/?$')
+
+STANDINGS_HEADER = ['Team', 'Team #', 'GADS', 'W', 'L', 'T', 'F', 'Pts', 'GF', 'GA', '+/-',
+                    'Head Coach', 'Asst Coach']
+
+
+def fixture_path(town_code, season_year, season_period, fixtures_dir=FIXTURES_DIR):
+    return os.path.join(fixtures_dir, f'{town_code}_{season_year}_{season_period}.html')
+
+
+def saved_targets(fixtures_dir=FIXTURES_DIR):
+    """(town_code, season_year, season_period) for every saved page"""
+    targets = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        match = re.match(r'^([A-Z]{3})_(\d{4})_(Fall|Spring)\.html$', name)
+        if match:
+            targets.append((match.group(1), int(match.group(2)), match.group(3)))
+    return targets
+
+
+def render_standings_page(town_name, season_year, season_period, teams_df):
+    """Render bays_teams.csv rows for one town/season as a standings page"""
+    def cell(value):
+        return '' if pd.isna(value) else html.escape(str(value))
+
+    body = []
+    for number, (_, team) in enumerate(teams_df.iterrows(), 1):
+        grade = team['age_group'].replace('Grade ', '')
+        gads = f"{team['gender'][0]} {grade} {team['division_level']}/{team['division_tier']}"
+        values = [team['team_name'], number, gads, team['wins'], team['losses'], team['ties'], 0,
+                  team['points'], team['goals_for'], team['goals_against'],
+                  f"{team['goal_differential']:+d}", team['head_coach'], team['assistant_coach']]
+        body.append('<tr>' + ''.join(f'<td>{cell(value)}</td>' for value in values) + '</tr>')
+
+    header = ''.join(f'<th>{html.escape(name)}</th>' for name in STANDINGS_HEADER)
+    title = f'{html.escape(town_name)} - {season_period} {season_year} Standings'
+    return (f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{title}</title></head>\n<body>\n'
+            f'<h1>{title}</h1>\n<table class="standings">\n<thead><tr>{header}</tr></thead>\n<tbody>\n'
+            + '\n'.join(body) + '\n</tbody>\n</table>\n</body>\n</html>\n')
+
+
+def save_from_csv(csv_path, towns=None):
+    """Write one saved page per town/season in the CSV; returns the number of pages written"""
+    teams_df = pd.read_csv(csv_path)
+    if towns:
+        teams_df = teams_df[teams_df['town_code'].isin(towns)]
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    pages = 0
+    for (town_code, season_year, season_period), season_df in teams_df.groupby(
+            ['town_code', 'season_year', 'season_period'], sort=True):
+        page = render_standings_page(season_df['town_name'].iloc[0], season_year, season_period, season_df)
+        with open(fixture_path(town_code, season_year, season_period), 'w', encoding='utf-8') as f:
+            f.write(page)
+        pages += 1
+    return pages
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve saved pages with validators; 404 for anything not saved"""
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without TCP_NODELAY keep-alive
+    # clients stall on delayed ACKs and the benchmark measures that instead
+    disable_nagle_algorithm = True
+    delay = 0.0
+    fixtures_dir = FIXTURES_DIR
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        match = PATH_PATTERN.match(self.path)
+        path = fixture_path(match.group('town'), match.group('year'), match.group('period'),
+                            self.fixtures_dir) if match else None
+        if path is None or not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        mtime = int(os.path.getmtime(path))
+        last_modified = formatdate(mtime, usegmt=True)
+
+        if self._not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag, mtime):
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(port=0, delay=0.0, fixtures_dir=FIXTURES_DIR):
+    """Start the server on a background thread; returns (server, base_url)"""
+    handler = type('ConfiguredFixtureHandler', (FixtureHandler,), {'delay': delay, 'fixtures_dir': fixtures_dir})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay saved BAYS standings pages locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='Simulated latency per page in seconds')
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR, help='Directory of saved pages')
+    parser.add_argument('--save-from-csv', action='store_true',
+                        help='Regenerate saved pages from data/bays_teams.csv instead of serving')
+    parser.add_argument('--csv', default='data/bays_teams.csv')
+    parser.add_argument('--towns', nargs='+', help='Town codes to save (default: all)')
+    args = parser.parse_args(argv)
+
+    if args.save_from_csv:
+        print(f'Saved {save_from_csv(args.csv, args.towns)} pages to {FIXTURES_DIR}')
+        return
+
+    server, base_url = start_fixture_server(args.port, args.delay, args.fixtures_dir)
+    print(f'Serving {len(saved_targets(args.fixtures_dir))} saved pages at {base_url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Streaming ingest for bays_teams.csv.
+Reads the CSV in fixed-size chunks, normalizes and validates each chunk with
+vectorized checks, streams the good rows into the typed store the dashboard
+reads (data_store.py) and writes rejected rows, with the reasons, to a
+quarantine CSV. Memory use is bounded by the chunk size, not the file size.
+
+    python ingest.py                                   # data/bays_teams.csv -> data/bays_teams.feather
+    python ingest.py --source league_dump.csv --chunksize 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import NamedTuple
+
+import pandas as pd
+
+from data_store import TEAM_COLUMNS, TEAM_DTYPES, TEAMS_CSV, StoreWriter, store_path
+
+DEFAULT_CHUNKSIZE = 50_000
+
+GENDERS = {'boys': 'Boys', 'boy': 'Boys', 'b': 'Boys', 'girls': 'Girls', 'girl': 'Girls', 'g': 'Girls'}
+PERIODS = {'fall': 'Fall', 'spring': 'Spring'}
+DIVISION_LEVELS = range(1, 5)
+
+REQUIRED_COLUMNS = ['town_code', 'season_year', 'season_period', 'team_name', 'division_level',
+                    'age_group', 'gender', 'wins', 'losses', 'ties', 'goals_for', 'goals_against']
+COUNT_COLUMNS = ['wins', 'losses', 'ties', 'goals_for', 'goals_against']
+INT_COLUMNS = [name for name, dtype in TEAM_DTYPES.items() if dtype.lower().startswith('int')]
+
+
+def quarantine_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.quarantine.csv'
+
+
+class ChunkResult(NamedTuple):
+    teams: pd.DataFrame        # typed, validated rows
+    rejected: pd.DataFrame     # raw rows plus a 'reason' column
+    derived: int               # rows with goal_differential/points filled in
+    point_deductions: int      # rows with points below 3W + T (league deductions, kept)
+
+
+def validate_chunk(raw):
+    """Normalize and validate one chunk of raw (all-string) bays_teams.csv rows"""
+    raw = raw.reindex(columns=TEAM_COLUMNS, fill_value='')
+    chunk = raw.apply(lambda col: col.str.strip())
+    reasons = pd.Series('', index=chunk.index)
+
+    def reject(mask, reason):
+        reasons[mask] = reasons[mask] + reason + '; '
+
+    # Canonical spellings
+    chunk['town_code'] = chunk['town_code'].str.upper()
+    chunk['gender'] = chunk['gender'].str.lower().map(GENDERS).fillna(chunk['gender'])
+    chunk['season_period'] = chunk['season_period'].str.lower().map(PERIODS).fillna(chunk['season_period'])
+
+    for name in REQUIRED_COLUMNS:
+        reject(chunk[name] == '', f'missing {name}')
+
+    # Integer columns ("18832.0" is accepted for integral values)
+    numbers = {}
+    for name in INT_COLUMNS:
+        values = pd.to_numeric(chunk[name].replace('', None), errors='coerce')
+        bad = (values.notna() & (values != values.round())) | (values.isna() & (chunk[name] != ''))
+        reject(bad, f'non-integer {name}')
+        numbers[name] = values.where(~bad)
+
+    # Derived columns: fill when blank, otherwise they must agree
+    expected_gd = numbers['goals_for'] - numbers['goals_against']
+    max_points = 3 * numbers['wins'] + numbers['ties']
+    derived = (numbers['goal_differential'].isna() & expected_gd.notna()) | \
+        (numbers['points'].isna() & max_points.notna())
+    numbers['goal_differential'] = numbers['goal_differential'].fillna(expected_gd)
+    numbers['points'] = numbers['points'].fillna(max_points)
+    reject(expected_gd.notna() & (numbers['goal_differential'] != expected_gd),
+           'goal_differential != goals_for - goals_against')
+    # BAYS deducts points (forfeits, sportsmanship), so points may be below 3W + T but never above
+    reject(numbers['points'] > max_points, 'points > 3 * wins + ties')
+    point_deductions = numbers['points'] < max_points
+
+    # Known values and ranges
+    reject(chunk['gender'].ne('') & ~chunk['gender'].isin(set(GENDERS.values())), 'unknown gender')
+    reject(chunk['season_period'].ne('') & ~chunk['season_period'].isin(set(PERIODS.values())), 'unknown season_period')
+    reject(numbers['division_level'].notna() & ~numbers['division_level'].isin(DIVISION_LEVELS),
+           'division_level outside 1-4')
+    for name in COUNT_COLUMNS:
+        reject(numbers[name] < 0, f'negative {name}')
+
+    # division_full is derivable from level + tier
+    missing_full = chunk['division_full'] == ''
+    chunk.loc[missing_full, 'division_full'] = 'Division ' + chunk['division_level'] + chunk['division_tier']
+
+    ok = reasons == ''
+    teams = chunk[ok].replace('', None)
+    for name in INT_COLUMNS:
+        teams[name] = numbers[name][ok].astype(TEAM_DTYPES[name])
+
+    rejected = raw[~ok].assign(reason=reasons[~ok].str.rstrip('; '))
+    return ChunkResult(teams.reset_index(drop=True), rejected,
+                       int((derived & ok).sum()), int((point_deductions & ok).sum()))
+
+
+def ingest_csv(csv_path=TEAMS_CSV, path=None, quarantine=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream csv_path through validation into the typed store; returns ingest stats"""
+    path = path or store_path(csv_path)
+    quarantine = quarantine or quarantine_path(csv_path)
+    if os.path.exists(quarantine):
+        os.remove(quarantine)
+
+    stats = {'rows': 0, 'ingested': 0, 'quarantined': 0, 'derived': 0, 'point_deductions': 0}
+    started = time.perf_counter()
+    with StoreWriter(csv_path, path) as writer:
+        for raw in pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunksize):
+            result = validate_chunk(raw)
+            writer.write(result.teams)
+            if len(result.rejected):
+                result.rejected.to_csv(quarantine, mode='a', index=False,
+                                       header=not os.path.exists(quarantine))
+            stats['rows'] += len(raw)
+            stats['ingested'] += len(result.teams)
+            stats['quarantined'] += len(result.rejected)
+            stats['derived'] += result.derived
+            stats['point_deductions'] += result.point_deductions
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate bays_teams.csv and build the typed store')
+    parser.add_argument('--source', default=TEAMS_CSV, help='CSV in the bays_teams.csv schema')
+    parser.add_argument('--store', help='Store to write (default: <source>.feather)')
+    parser.add_argument('--quarantine', help='Rejected rows (default: <source>.quarantine.csv)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='Rows per chunk')
+    args = parser.parse_args(argv)
+
+    stats = ingest_csv(args.source, args.store, args.quarantine, args.chunksize)
+    print(json.dumps(stats))
+    if stats['quarantined']:
+        print(f"{stats['quarantined']} rows quarantined in {args.quarantine or quarantine_path(args.source)}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Opt-in hot-path instrumentation for the dashboard.
+A Rerun records the wall and CPU time of one script run (or one fragment
+rerun), the time spent in each named stage, and the hits, misses and call time
+of every cached function. Finished reruns can be appended to a JSON-lines log,
+one object per line, so latency percentiles can be aggregated across sessions.
+Recording is per thread (each Streamlit session runs its script on its own
+thread) and every hook is a no-op while no rerun is being recorded.
+
+    DASHBOARD_PERF_LOG=perf.jsonl streamlit run streamlit_dashboard.py
+    python perf.py perf.jsonl               # p50/p90/p99 per rerun kind, stage and cached function
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import sys
+import threading
+import time
+
+# Environment variable naming the JSON-lines log; setting it turns recording on for every session
+PERF_LOG_ENV = 'DASHBOARD_PERF_LOG'
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class Rerun:
+    """Timings of one script run or fragment rerun; stage and cache times are inclusive of nested calls"""
+
+    def __init__(self, kind, session=None):
+        self.kind = kind
+        self.session = session
+        self.started_at = time.time()
+        self.stages = {}
+        self.cache = {}
+        self._cache_calls = []
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def add_stage(self, name, seconds):
+        entry = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+
+    def add_cache_call(self, name, hit, seconds):
+        entry = self.cache.setdefault(name, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+        entry['hits' if hit else 'misses'] += 1
+        entry['seconds'] += seconds
+
+    def record(self, **context):
+        """The finished rerun as a JSON-ready dict (extra context fields are included as given)"""
+        return {
+            'ts': round(self.started_at, 3),
+            'session': self.session,
+            'kind': self.kind,
+            **context,
+            'wall_seconds': round(time.perf_counter() - self._wall, 6),
+            'cpu_seconds': round(time.thread_time() - self._cpu, 6),
+            'stages': {name: {'calls': entry['calls'], 'seconds': round(entry['seconds'], 6)}
+                       for name, entry in self.stages.items()},
+            'cache': {name: {**entry, 'seconds': round(entry['seconds'], 6)} for name, entry in self.cache.items()},
+        }
+
+
+def current_rerun():
+    """The rerun being recorded on this thread, or None"""
+    return getattr(_local, 'rerun', None)
+
+
+def start_rerun(kind, session=None):
+    """Start recording a rerun on this thread (replacing one left unfinished by an interrupted run)"""
+    _local.rerun = Rerun(kind, session)
+    return _local.rerun
+
+
+def finish_rerun(log_path=None, **context):
+    """Stop recording on this thread; returns the record (None if nothing was recorded), logged if log_path is set"""
+    rerun = current_rerun()
+    if rerun is None:
+        return None
+    _local.rerun = None
+    record = rerun.record(**context)
+    if log_path:
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with _log_lock, open(log_path, 'a') as f:
+            f.write(line)
+    return record
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time the enclosed block as one call of a named stage of the current rerun"""
+    rerun = current_rerun()
+    if rerun is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.add_stage(name, time.perf_counter() - started)
+
+
+def instrument_cache(cache_decorator):
+    """Apply a caching decorator (st.cache_data(...), st.cache_resource(...)) with hit/miss counting.
+
+    The function body only runs on a miss, so a marker inside it tells the wrapper around
+    the cached function whether that call was answered from the cache. The call time
+    includes hashing the arguments and, for cache_data, copying the cached value.
+    """
+    def decorate(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            rerun = current_rerun()
+            if rerun is not None and rerun._cache_calls:
+                rerun._cache_calls[-1]['hit'] = False
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            rerun = current_rerun()
+            if rerun is None:
+                return cached(*args, **kwargs)
+            frame = {'hit': True}
+            rerun._cache_calls.append(frame)
+            started = time.perf_counter()
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                rerun._cache_calls.pop()
+                rerun.add_cache_call(name, frame['hit'], time.perf_counter() - started)
+
+        call.clear = cached.clear
+        return call
+    return decorate
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * pct // 100) - 1)]
+
+
+def summarize(records, percentiles=(50, 90, 99)):
+    """Latency percentiles (ms) per rerun kind, stage and cached function over logged reruns; returns rows"""
+    samples = {}
+    hits = {}
+    for record in records:
+        samples.setdefault(('rerun', record['kind']), []).append(record['wall_seconds'])
+        for name, entry in record['stages'].items():
+            samples.setdefault(('stage', name), []).append(entry['seconds'])
+        for name, entry in record['cache'].items():
+            samples.setdefault(('cache', name), []).append(entry['seconds'])
+            counts = hits.setdefault(name, [0, 0])
+            counts[0] += entry['hits']
+            counts[1] += entry['hits'] + entry['misses']
+
+    rows = []
+    for (group, name), values in sorted(samples.items()):
+        row = {'group': group, 'name': name, 'n': len(values)}
+        row.update({f'p{pct}_ms': round(percentile(values, pct) * 1000, 1) for pct in percentiles})
+        if group == 'cache':
+            row['hit_rate'] = round(hits[name][0] / hits[name][1], 3) if hits[name][1] else None
+        rows.append(row)
+    return rows
+
+
+def read_log(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Latency percentiles from a dashboard perf log')
+    parser.add_argument('log', help='JSON-lines log written with DASHBOARD_PERF_LOG set')
+    parser.add_argument('--session', help='Only reruns of this session')
+    parser.add_argument('--json', action='store_true', help='Print the rows as JSON')
+    args = parser.parse_args(argv)
+
+    records = [record for record in read_log(args.log) if args.session in (None, record['session'])]
+    if not records:
+        print(f'No reruns in {args.log}', file=sys.stderr)
+        return 1
+    rows = summarize(records)
+    if args.json:
+        print(json.dumps(rows, indent=1))
+        return 0
+
+    print(f"{len(records)} reruns, {len({record['session'] for record in records})} sessions")
+    print(f"{'':6} {'name':32} {'n':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'hits':>6}")
+    for row in rows:
+        hit_rate = '' if row.get('hit_rate') is None else f"{row['hit_rate']:.0%}"
+        print(f"{row['group']:6} {row['name']:32} {row['n']:>6} {row['p50_ms']:>9.1f} {row['p90_ms']:>9.1f} "
+              f"{row['p99_ms']:>9.1f} {hit_rate:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+The dashboard and the read-only metrics API (api.py) in one process on one
+port: Streamlit serves the app and the API's routes are mounted at /api, so
+programmatic clients get JSON/CSV without opening a Streamlit session.
+
+    streamlit run server.py --server.port 8501
+"""
+
+import streamlit as st
+from starlette.routing import Mount
+
+import api
+
+app = st.App('streamlit_dashboard.py', routes=[Mount('/api', routes=api.routes)])
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Precomputed metrics snapshot for the dashboard.
+Materializes the metrics frame and the trend series (with every town as the
+focus) for every year range the sidebar slider can select into one small
+gzipped JSON file, stamped with the source CSVs it was built from. A fresh dashboard process loads the snapshot
+instead of parsing and aggregating the team data; selections the snapshot does
+not cover, or a snapshot built from older data, fall back to the live path.
+
+    python snapshot.py                     # rebuild data/metrics_snapshot.json.gz
+    python snapshot.py --check             # exit 1 if the snapshot is missing or stale
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import sys
+
+import pandas as pd
+
+from analytics import (METRIC_COLUMNS, TOWN_NAMES, build_cube, build_time_series_by_town,
+                       metrics_from_cube, select_cube)
+from data_store import ENROLLMENT_CSV, TEAMS_CSV, file_sha256, load_teams
+
+SNAPSHOT_PATH = 'data/metrics_snapshot.json.gz'
+SNAPSHOT_FORMAT = 2
+
+# What the dashboard asks for: both periods, all configured towns (every one as a possible focus)
+SNAPSHOT_PERIODS = ('Fall', 'Spring')
+
+# dtypes of the metrics frame built by analytics.metrics_from_cube
+METRIC_DTYPES = {'Town': object, **{name: 'float64' for name in METRIC_COLUMNS}, 'Enrollment': 'int64'}
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+def _sources_match(sources):
+    """True when every recorded source file is unchanged (size/mtime, falling back to content hash)"""
+    for path, recorded in sources.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size == recorded['size'] and stat.st_mtime_ns == recorded['mtime_ns']:
+            continue
+        # Touched but not edited (e.g. a fresh checkout on deploy) - the contents decide
+        if stat.st_size != recorded['size'] or file_sha256(path) != recorded['sha256']:
+            return False
+    return True
+
+
+def year_ranges(years):
+    """Every inclusive (first, last) range the year slider can select"""
+    return [(first, last) for i, first in enumerate(years) for last in years[i:]]
+
+
+def build_snapshot(teams_csv=TEAMS_CSV, enrollment_csv=ENROLLMENT_CSV, town_names=TOWN_NAMES,
+                   periods=SNAPSHOT_PERIODS):
+    """Compute metrics and trend series for every year range; returns the snapshot document"""
+    towns = list(town_names)
+    enrollment_df = pd.read_csv(enrollment_csv)
+    enrollment_map = {town: int(value) for town, value in zip(enrollment_df['town_code'], enrollment_df['enrollment'])}
+    cube = build_cube(load_teams(teams_csv))
+    years = sorted(int(year) for year in cube.index.get_level_values('season_year').unique())
+
+    ranges = []
+    for first, last in year_ranges(years):
+        cube_slice = select_cube(cube, range(first, last + 1), periods)
+        metrics_df = metrics_from_cube(cube_slice, towns, enrollment_map, town_names)
+        series_years, series_by_town = build_time_series_by_town(cube_slice, towns, enrollment_map)
+        ranges.append({
+            'year_range': [first, last],
+            'metrics': {'index': list(metrics_df.index), 'columns': metrics_df.to_dict(orient='list')},
+            'time_series': {'years': series_years, 'by_town': series_by_town},
+        })
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'sources': {path: source_fingerprint(path) for path in (teams_csv, enrollment_csv)},
+        'years': years,
+        'periods': list(periods),
+        'towns': towns,
+        'enrollment': enrollment_map,
+        'ranges': ranges,
+    }
+
+
+def write_snapshot(document, path=SNAPSHOT_PATH):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    # mtime=0 keeps the file byte-identical across rebuilds of the same data
+    with open(tmp_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        f.write(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Loaded snapshot; frames are only built for the year ranges actually requested"""
+
+    def __init__(self, document):
+        self.years = document['years']
+        self.periods = tuple(document['periods'])
+        self.towns = tuple(document['towns'])
+        self.enrollment_map = document['enrollment']
+        self._ranges = {tuple(entry['year_range']): entry for entry in document['ranges']}
+        self._sources = {path: dict(recorded) for path, recorded in document['sources'].items()}
+
+    def _sources_current(self):
+        """True while the source CSVs are the ones the snapshot was built from"""
+        if not _sources_match(self._sources):
+            return False
+        # A touched but unedited file is hashed once, not on every lookup
+        for path, recorded in self._sources.items():
+            recorded['mtime_ns'] = os.stat(path).st_mtime_ns
+        return True
+
+    def _entry(self, year_range, periods, towns_list):
+        if tuple(periods) != self.periods or tuple(towns_list) != self.towns:
+            return None
+        if not self._sources_current():
+            return None
+        return self._ranges.get(tuple(year_range))
+
+    def metrics(self, year_range, periods, towns_list):
+        """Precomputed metrics frame, or None if this selection is not in the snapshot or the data changed"""
+        entry = self._entry(year_range, periods, towns_list)
+        if entry is None:
+            return None
+        metrics = entry['metrics']
+        return pd.DataFrame(metrics['columns'], index=metrics['index']).astype(METRIC_DTYPES)
+
+    def time_series(self, year_range, periods, towns_list):
+        """Precomputed (years, {focus town: time_series_data}), or None if not in the snapshot or the data changed"""
+        entry = self._entry(year_range, periods, towns_list)
+        if entry is None:
+            return None
+        return list(entry['time_series']['years']), copy.deepcopy(entry['time_series']['by_town'])
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """The snapshot at path, or None if it is missing, unreadable or built from other data"""
+    try:
+        with gzip.open(path, 'rb') as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if document.get('format') != SNAPSHOT_FORMAT or not _sources_match(document['sources']):
+        return None
+    return Snapshot(document)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute dashboard metrics for every year range')
+    parser.add_argument('--output', default=SNAPSHOT_PATH)
+    parser.add_argument('--check', action='store_true', help='Only report whether the snapshot is current')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        current = load_snapshot(args.output) is not None
+        print(f"{args.output} is {'current' if current else 'missing or stale'}")
+        return 0 if current else 1
+
+    document = build_snapshot()
+    write_snapshot(document, args.output)
+    print(f"Wrote {len(document['ranges'])} year ranges to {args.output} ({os.path.getsize(args.output):,} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Modules live at the repo root; data paths in data_store are relative to it
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics import TOWN_NAMES  # noqa: E402
+from data_store import ENROLLMENT_CSV, TEAMS_CSV, load_teams  # noqa: E402
+from snapshot import year_ranges  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def teams_df():
+    return load_teams(os.path.join(ROOT, TEAMS_CSV))
+
+
+@pytest.fixture(scope='session')
+def enrollment_map():
+    enrollment_df = pd.read_csv(os.path.join(ROOT, ENROLLMENT_CSV))
+    return dict(zip(enrollment_df['town_code'], enrollment_df['enrollment']))
+
+
+@pytest.fixture(scope='session')
+def towns():
+    return list(TOWN_NAMES)
+
+
+def league_year_ranges():
+    """Every year range the slider can select on the committed data"""
+    years = pd.read_csv(os.path.join(ROOT, TEAMS_CSV), usecols=['season_year'])['season_year']
+    return year_ranges(sorted(int(year) for year in years.unique()))
+
+
+def filter_teams(teams_df, year_range, periods):
+    """Team rows of an inclusive year range and the given periods (the dashboard's old filter)"""
+    years = range(year_range[0], year_range[1] + 1)
+    return teams_df[teams_df['season_year'].isin(years) & teams_df['season_period'].isin(periods)]
@@ -0,0 +1,109 @@
+"""API route handlers: ETag/304 handshake, gzip negotiation, error statuses and the LRU body cache"""
+
+import asyncio
+import gzip
+from collections import OrderedDict
+
+import pytest
+from starlette.requests import Request
+
+import api
+from conftest import ROOT
+
+
+@pytest.fixture(autouse=True)
+def bodies(monkeypatch):
+    # Data paths are relative to the repo root; every test starts with an empty body cache
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(api, '_bodies', OrderedDict())
+    return api._bodies
+
+
+def get(handler, query='', headers=None, **path_params):
+    """Call a route handler with a GET request (starlette's TestClient needs httpx)"""
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': '/', 'query_string': query.encode(),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'path_params': path_params,
+    }
+    return asyncio.run(handler(Request(scope)))
+
+
+def test_repeat_request_is_not_modified():
+    first = get(api.metrics, 'first=2021&last=2025')
+    assert first.status_code == 200
+    etag = first.headers['etag']
+
+    assert get(api.metrics, 'first=2021&last=2025', {'If-None-Match': etag}).status_code == 304
+    assert get(api.metrics, 'first=2021&last=2025', {'If-None-Match': f'"stale", W/{etag}'}).status_code == 304
+    assert get(api.metrics, 'first=2021&last=2024', {'If-None-Match': etag}).status_code == 200
+
+
+def test_gzip_negotiation():
+    identity = get(api.metrics, 'first=2023&last=2025')
+    compressed = get(api.metrics, 'first=2023&last=2025', {'Accept-Encoding': 'br, gzip'})
+    assert 'content-encoding' not in identity.headers
+    assert compressed.headers['content-encoding'] == 'gzip'
+    assert gzip.decompress(compressed.body) == identity.body
+    assert compressed.headers['etag'] == identity.headers['etag'][:-1] + '-gzip"'
+    assert compressed.headers['vary'] == 'Accept-Encoding'
+
+    refused = get(api.metrics, 'first=2023&last=2025', {'Accept-Encoding': 'gzip;q=0'})
+    assert 'content-encoding' not in refused.headers
+    assert refused.body == identity.body and refused.headers['etag'] == identity.headers['etag']
+
+    # Either ETag variant revalidates
+    assert get(api.metrics, 'first=2023&last=2025', {'If-None-Match': compressed.headers['etag']}).status_code == 304
+
+
+def test_query_order_case_and_unknown_parameters_share_an_entry(bodies):
+    reference = get(api.metrics, 'first=2021&last=2025')
+    for query in ('last=2025&first=2021', 'first=2021&last=2025&utm_source=mail', 'last=2025&zzz=1&first=2021'):
+        response = get(api.metrics, query)
+        assert response.body == reference.body and response.headers['etag'] == reference.headers['etag']
+    assert len(bodies) == 1
+
+    lower = get(api.time_series, 'first=2024&last=2025', town='fox')
+    upper = get(api.time_series, 'last=2025&first=2024&x=1', town='FOX')
+    assert lower.body == upper.body
+    assert len(bodies) == 2
+
+
+@pytest.mark.parametrize('handler, query, town, status', [
+    (api.metrics, 'format=xml', None, 400),
+    (api.metrics, 'first=x', None, 400),
+    (api.metrics, 'first=2025&last=2021', None, 400),
+    (api.metrics, 'first=1999', None, 400),
+    (api.assessment, 'format=csv', 'FOX', 400),
+    (api.assessment, '', 'XXX', 404),
+    (api.time_series, '', 'xyz', 404),
+])
+def test_errors(bodies, handler, query, town, status):
+    response = get(handler, query, **({'town': town} if town else {}))
+    assert response.status_code == status
+    assert response.headers['cache-control'] == 'no-store'
+    assert len(bodies) == 0
+
+
+def test_eviction_drops_least_recently_used(bodies, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_CACHED_BODIES', 2)
+    version = api.data_version()
+    keys = [(version, 'ranks_body', 'json', (first, 2025), None) for first in (2021, 2022, 2023)]
+
+    api.build_body(keys[0], api.ranks_body, version, 'json', (2021, 2025))
+    api.build_body(keys[1], api.ranks_body, version, 'json', (2022, 2025))
+    assert api.lookup_body(keys[0]) is not None
+    api.build_body(keys[2], api.ranks_body, version, 'json', (2023, 2025))
+
+    assert list(bodies) == [keys[0], keys[2]]
+    assert api.lookup_body(keys[1]) is None
+
+
+def test_hit_is_served_from_the_cache(bodies, monkeypatch):
+    first = get(api.ranks, 'first=2022&last=2025')
+
+    def fail(*args):
+        raise AssertionError('body rebuilt on a cache hit')
+
+    monkeypatch.setattr(api, 'build_body', fail)
+    assert get(api.ranks, 'last=2025&first=2022').body == first.body
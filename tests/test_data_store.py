@@ -0,0 +1,25 @@
+"""load_teams: the typed store and the read-only fallback serve the same schema"""
+
+import os
+import shutil
+
+import pandas as pd
+
+import ingest
+from conftest import ROOT
+from data_store import TEAM_DTYPES, TEAMS_CSV, load_teams
+
+
+def test_read_only_fallback_matches_store(tmp_path, monkeypatch, teams_df):
+    csv_path = tmp_path / os.path.basename(TEAMS_CSV)
+    shutil.copyfile(os.path.join(ROOT, TEAMS_CSV), csv_path)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError('read-only filesystem')
+
+    monkeypatch.setattr(ingest, 'ingest_csv', read_only)
+    fallback = load_teams(str(csv_path))
+
+    assert {name: str(dtype) for name, dtype in fallback.dtypes.items()} == \
+           {name: str(pd.Series(dtype=dtype).dtype) for name, dtype in TEAM_DTYPES.items()}
+    pd.testing.assert_frame_equal(fallback, teams_df, check_categorical=False)
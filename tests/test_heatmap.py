@@ -0,0 +1,101 @@
+"""Appendix heat-map styles against the per-column highlight function they replaced"""
+
+import itertools
+
+import pandas as pd
+import pytest
+
+from analytics import RANK_DIRECTIONS, TOWN_NAMES, build_cube, metrics_from_cube, select_cube
+from charts import heatmap_styles, style_metrics_table
+from conftest import league_year_ranges
+
+HIGHER_IS_BETTER = ['Win %', 'Goal Diff', 'Participation Rate', 'Retention %', 'Goals For', 'Growth %']
+LOWER_IS_BETTER = ['Goals Against', 'Avg Division']
+
+
+def highlight_vs_avg(s, col_name):
+    """Apply color gradient based on comparison to average (the Appendix's old per-column styler, verbatim)"""
+    avg = s.mean()
+    styles = []
+
+    for val in s:
+        if col_name in HIGHER_IS_BETTER:
+            # Higher is better
+            if val > avg:
+                diff = (val - avg) / (s.max() - avg) if s.max() > avg else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(0, 200, 0, {intensity})'
+            elif val < avg:
+                diff = (avg - val) / (avg - s.min()) if avg > s.min() else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(255, 100, 100, {intensity})'
+            else:
+                color = ''
+        elif col_name in LOWER_IS_BETTER:
+            # Lower is better
+            if val < avg:
+                diff = (avg - val) / (avg - s.min()) if avg > s.min() else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(0, 200, 0, {intensity})'
+            elif val > avg:
+                diff = (val - avg) / (s.max() - avg) if s.max() > avg else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(255, 100, 100, {intensity})'
+            else:
+                color = ''
+        elif col_name == 'Gender Balance':
+            # Closeness to 50 is better
+            dist_from_50 = abs(val - 50)
+            avg_dist = abs(s - 50).mean()
+            if dist_from_50 < avg_dist:
+                diff = (avg_dist - dist_from_50) / avg_dist if avg_dist > 0 else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(0, 200, 0, {intensity})'
+            elif dist_from_50 > avg_dist:
+                diff = (dist_from_50 - avg_dist) / (abs(s - 50).max() - avg_dist) if abs(s - 50).max() > avg_dist else 0
+                intensity = min(diff * 0.5, 0.5)
+                color = f'background-color: rgba(255, 100, 100, {intensity})'
+            else:
+                color = ''
+        else:
+            color = ''
+        styles.append(color)
+
+    return styles
+
+
+def reference_styles(display_df):
+    return pd.DataFrame({col: highlight_vs_avg(display_df[col], col) for col in RANK_DIRECTIONS},
+                        index=display_df.index)
+
+
+# Town selections: all towns, every town left out once, and a few small groups
+TOWN_SELECTIONS = ([list(TOWN_NAMES)] + [[t for t in TOWN_NAMES if t != left_out] for left_out in TOWN_NAMES]
+                   + [list(group) for group in itertools.combinations(['FOX', 'HOP', 'WAL', 'MDY'], 2)])
+
+
+@pytest.fixture(scope='module')
+def cube(teams_df):
+    return build_cube(teams_df)
+
+
+@pytest.mark.parametrize('year_range', league_year_ranges(), ids=lambda r: f'{r[0]}-{r[1]}')
+def test_heatmap_styles_match_highlight(cube, enrollment_map, towns, year_range):
+    cube_slice = select_cube(cube, range(year_range[0], year_range[1] + 1), ('Fall', 'Spring'))
+    metrics_df = metrics_from_cube(cube_slice, towns, enrollment_map, TOWN_NAMES)
+    for selection in TOWN_SELECTIONS:
+        display_df = metrics_df.loc[[town for town in selection if town in metrics_df.index]].drop(columns=['Enrollment'])
+        pd.testing.assert_frame_equal(heatmap_styles(display_df[list(RANK_DIRECTIONS)]), reference_styles(display_df),
+                                      check_exact=True, obj=f'{selection}')
+
+
+def test_style_metrics_table_applies_heatmap(cube, enrollment_map, towns):
+    display_df = metrics_from_cube(cube, towns, enrollment_map, TOWN_NAMES).drop(columns=['Enrollment'])
+    styled = style_metrics_table(display_df)
+    styled._compute()
+    expected = reference_styles(display_df)
+    # Every colored cell of the rendered Styler carries the reference style
+    reference = {(display_df.index.get_loc(town), display_df.columns.get_loc(col)): css
+                 for town in display_df.index for col, css in expected.loc[town].items() if css}
+    rendered = {cell: '; '.join(f'{prop}: {value}' for prop, value in css) for cell, css in styled.ctx.items()}
+    assert rendered == reference
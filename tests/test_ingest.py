@@ -0,0 +1,69 @@
+"""Streaming ingest: one bad row per validation rule, quarantined with its reason at any chunk size"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from data_store import TEAM_COLUMNS, TEAM_DTYPES, TEAMS_CSV, read_store
+from ingest import ingest_csv, quarantine_path
+
+# Changes applied to a valid row, and the quarantine reason each should produce ('' = kept)
+ROWS = [
+    ({}, ''),
+    ({'town_code': 'ash', 'gender': 'g', 'season_period': ' fall ', 'goal_differential': '', 'points': ''}, ''),
+    ({'goal_differential': '-3'}, 'goal_differential != goals_for - goals_against'),
+    ({'points': '14'}, 'points > 3 * wins + ties'),
+    ({'points': '10'}, ''),
+    ({'gender': 'Coed'}, 'unknown gender'),
+    ({'season_period': 'Summer'}, 'unknown season_period'),
+    ({'division_level': '5'}, 'division_level outside 1-4'),
+    ({'wins': 'four'}, 'non-integer wins'),
+    ({'age_group': ''}, 'missing age_group'),
+    ({'goals_against': '-1', 'goal_differential': '16'}, 'negative goals_against'),
+    ({'town_population': '18832.0', 'division_full': ''}, ''),
+]
+
+
+@pytest.fixture
+def source_csv(tmp_path):
+    template = pd.read_csv(os.path.join(ROOT, TEAMS_CSV), dtype=str, keep_default_na=False, nrows=1).iloc[0]
+    assert (template['wins'], template['ties'], template['points']) == ('4', '1', '13')
+    rows = [{**template, 'team_name': f'Team {number}', **changes} for number, (changes, _) in enumerate(ROWS)]
+    path = tmp_path / 'teams.csv'
+    pd.DataFrame(rows, columns=TEAM_COLUMNS).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('chunksize', [1, 4, 100])
+def test_ingest_quarantines_each_rule(source_csv, tmp_path, chunksize):
+    store = str(tmp_path / 'teams.feather')
+    stats = ingest_csv(source_csv, store, chunksize=chunksize)
+
+    kept = [f'Team {number}' for number, (_, reason) in enumerate(ROWS) if not reason]
+    assert stats['rows'] == len(ROWS)
+    assert (stats['ingested'], stats['quarantined']) == (len(kept), len(ROWS) - len(kept))
+    assert (stats['derived'], stats['point_deductions']) == (1, 1)
+
+    quarantine = pd.read_csv(quarantine_path(source_csv), dtype=str, keep_default_na=False)
+    assert list(zip(quarantine['team_name'], quarantine['reason'])) == \
+           [(f'Team {number}', reason) for number, (_, reason) in enumerate(ROWS) if reason]
+
+    teams = read_store(store)
+    assert {name: str(dtype) for name, dtype in teams.dtypes.items()} == \
+           {name: str(pd.Series(dtype=dtype).dtype) for name, dtype in TEAM_DTYPES.items()}
+    assert list(teams['team_name']) == kept
+
+    normalized = teams.set_index('team_name').loc['Team 1']
+    assert (normalized['town_code'], normalized['gender'], normalized['season_period']) == ('ASH', 'Girls', 'Fall')
+    assert (normalized['goal_differential'], normalized['points']) == (-4, 13)
+    filled = teams.set_index('team_name').loc['Team 11']
+    assert (filled['town_population'], filled['division_full']) == (18832, 'Division 3E')
+
+
+def test_clean_source_leaves_no_quarantine(source_csv, tmp_path):
+    pd.read_csv(source_csv, dtype=str, keep_default_na=False).iloc[[0]].to_csv(source_csv, index=False)
+    stats = ingest_csv(source_csv, str(tmp_path / 'teams.feather'), chunksize=1)
+    assert (stats['ingested'], stats['quarantined']) == (1, 0)
+    assert not os.path.exists(quarantine_path(source_csv))
@@ -0,0 +1,118 @@
+"""build_metrics / metrics_from_cube against the per-town loop they replaced"""
+
+import pandas as pd
+import pytest
+
+from analytics import TOWN_NAMES, build_cube, build_metrics, metrics_from_cube, select_cube
+from conftest import filter_teams, league_year_ranges
+
+PERIOD_SUBSETS = [('Fall', 'Spring'), ('Fall',), ('Spring',)]
+
+
+def reference_metrics(filtered_metrics_input, towns_list, enrollment_map, town_names):
+    """The dashboard's calculate_metrics before the groupby engine, kept verbatim as the reference"""
+    metrics = {}
+
+    for town in towns_list:
+        town_df = filtered_metrics_input[filtered_metrics_input['town_code'] == town]
+        enrollment = enrollment_map[town]
+        total = len(town_df)
+
+        if total == 0:
+            continue
+
+        # Participation Rate
+        teams_per_100 = (total / 10) / enrollment * 100
+
+        # Win Percentage
+        total_games = town_df['wins'].sum() + town_df['losses'].sum() + town_df['ties'].sum()
+        win_pct = (town_df['wins'].sum() + 0.5 * town_df['ties'].sum()) / total_games * 100 if total_games > 0 else 0
+
+        # Goal Differential per Team
+        avg_gd = round(town_df['goal_differential'].sum() / total, 1)
+
+        # Spring Retention Rate
+        fall_teams = len(town_df[town_df['season_period'] == 'Fall']) / 5
+        spring_teams = len(town_df[town_df['season_period'] == 'Spring']) / 5
+        retention = (spring_teams / fall_teams * 100) if fall_teams > 0 else 0
+
+        # Goals For/Against per Team
+        avg_gf = town_df['goals_for'].sum() / total
+        avg_ga = town_df['goals_against'].sum() / total
+
+        # Division Distribution
+        avg_division = town_df['division_level'].mean()
+
+        # Gender Balance (% girls, 50 is perfect)
+        boys = len(town_df[town_df['gender'] == 'Boys'])
+        girls = len(town_df[town_df['gender'] == 'Girls'])
+        girls_pct = (girls / total * 100) if total > 0 else 50
+
+        # Growth Rate (dynamic based on filtered years)
+        years_in_data = sorted(town_df['season_year'].unique())
+        if len(years_in_data) >= 2:
+            baseline_year = min(years_in_data)
+            current_year = max(years_in_data)
+            fall_baseline = len(town_df[(town_df['season_year'] == baseline_year) & (town_df['season_period'] == 'Fall')])
+            fall_current = len(town_df[(town_df['season_year'] == current_year) & (town_df['season_period'] == 'Fall')])
+            growth_pct = round(((fall_current - fall_baseline) / fall_baseline) * 100, 1) if fall_baseline > 0 else 0
+        else:
+            growth_pct = 0
+
+        metrics[town] = {
+            'Town': town_names[town],
+            'Participation Rate': float(teams_per_100),
+            'Win %': float(win_pct),
+            'Goal Diff': float(avg_gd),
+            'Retention %': float(retention),
+            'Goals For': float(avg_gf),
+            'Goals Against': float(avg_ga),
+            'Avg Division': float(avg_division),
+            'Gender Balance': float(girls_pct),
+            'Growth %': float(growth_pct),
+            'Enrollment': int(enrollment)
+        }
+
+    df_result = pd.DataFrame(metrics).T
+
+    # Ensure all numeric columns are properly typed
+    numeric_columns = ['Participation Rate', 'Win %', 'Goal Diff', 'Retention %',
+                       'Goals For', 'Goals Against', 'Avg Division', 'Gender Balance',
+                       'Growth %', 'Enrollment']
+    for col in numeric_columns:
+        df_result[col] = pd.to_numeric(df_result[col], errors='coerce')
+
+    return df_result
+
+
+@pytest.fixture(scope='module')
+def cube(teams_df):
+    return build_cube(teams_df)
+
+
+@pytest.mark.parametrize('periods', PERIOD_SUBSETS, ids='+'.join)
+@pytest.mark.parametrize('year_range', league_year_ranges(), ids=lambda r: f'{r[0]}-{r[1]}')
+def test_metrics_from_cube_matches_loop(cube, teams_df, enrollment_map, towns, year_range, periods):
+    expected = reference_metrics(filter_teams(teams_df, year_range, periods), towns, enrollment_map, TOWN_NAMES)
+    cube_slice = select_cube(cube, range(year_range[0], year_range[1] + 1), periods)
+    actual = metrics_from_cube(cube_slice, towns, enrollment_map, TOWN_NAMES)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+@pytest.mark.parametrize('periods', PERIOD_SUBSETS, ids='+'.join)
+def test_build_metrics_matches_loop(teams_df, enrollment_map, towns, periods):
+    filtered = filter_teams(teams_df, (2022, 2024), periods)
+    expected = reference_metrics(filtered, towns, enrollment_map, TOWN_NAMES)
+    pd.testing.assert_frame_equal(build_metrics(filtered, towns, enrollment_map, TOWN_NAMES), expected,
+                                  check_exact=True)
+
+
+def test_town_subset_and_missing_town(teams_df, enrollment_map):
+    # Towns without rows are dropped, the others keep towns_list order
+    towns_list = ['HOP', 'FOX', 'MDY']
+    filtered = filter_teams(teams_df, (2023, 2025), ('Fall', 'Spring'))
+    filtered = filtered[filtered['town_code'] != 'MDY']
+    expected = reference_metrics(filtered, towns_list, enrollment_map, TOWN_NAMES)
+    actual = build_metrics(filtered, towns_list, enrollment_map, TOWN_NAMES)
+    assert list(actual.index) == ['HOP', 'FOX']
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
@@ -0,0 +1,56 @@
+"""rank_metrics against the per-metric count expressions it replaced"""
+
+import pytest
+
+from analytics import TOWN_NAMES, build_cube, metrics_from_cube, rank_metrics, select_cube
+from conftest import league_year_ranges
+
+PERIOD_SUBSETS = [('Fall', 'Spring'), ('Fall',), ('Spring',)]
+
+
+def reference_ranks(metrics_df, town):
+    """One town's ranks as the dashboard used to count them (towns at least as good, itself included)"""
+    town_metrics = metrics_df.loc[town]
+
+    def distance_from_50(val):
+        return abs(val - 50)
+
+    return {
+        'Participation Rate': (metrics_df['Participation Rate'] >= town_metrics['Participation Rate']).sum(),
+        'Win %': (metrics_df['Win %'] >= town_metrics['Win %']).sum(),
+        'Goal Diff': (metrics_df['Goal Diff'] >= town_metrics['Goal Diff']).sum(),
+        'Retention %': (metrics_df['Retention %'] >= town_metrics['Retention %']).sum(),
+        'Goals For': (metrics_df['Goals For'] >= town_metrics['Goals For']).sum(),
+        'Goals Against': (metrics_df['Goals Against'] <= town_metrics['Goals Against']).sum(),
+        'Avg Division': (metrics_df['Avg Division'] <= town_metrics['Avg Division']).sum(),
+        'Gender Balance': (metrics_df['Gender Balance'].apply(distance_from_50)
+                           <= distance_from_50(town_metrics['Gender Balance'])).sum(),
+        'Growth %': (metrics_df['Growth %'] >= town_metrics['Growth %']).sum(),
+    }
+
+
+@pytest.fixture(scope='module')
+def cube(teams_df):
+    return build_cube(teams_df)
+
+
+@pytest.mark.parametrize('periods', PERIOD_SUBSETS, ids='+'.join)
+@pytest.mark.parametrize('year_range', league_year_ranges(), ids=lambda r: f'{r[0]}-{r[1]}')
+def test_rank_metrics_matches_counts(cube, enrollment_map, towns, year_range, periods):
+    cube_slice = select_cube(cube, range(year_range[0], year_range[1] + 1), periods)
+    metrics_df = metrics_from_cube(cube_slice, towns, enrollment_map, TOWN_NAMES)
+    ranks_df = rank_metrics(metrics_df)
+    for town in metrics_df.index:
+        assert ranks_df.loc[town].to_dict() == reference_ranks(metrics_df, town), town
+
+
+def test_ties_share_the_lower_position(cube, enrollment_map, towns):
+    metrics_df = metrics_from_cube(cube, towns, enrollment_map, TOWN_NAMES)
+    metrics_df['Win %'] = 50.0
+    metrics_df.loc['FOX', 'Gender Balance'] = 45.0
+    metrics_df.loc['ASH', 'Gender Balance'] = 55.0
+    ranks_df = rank_metrics(metrics_df)
+    assert (ranks_df['Win %'] == len(metrics_df)).all()
+    assert ranks_df.at['FOX', 'Gender Balance'] == ranks_df.at['ASH', 'Gender Balance']
+    for town in metrics_df.index:
+        assert ranks_df.loc[town].to_dict() == reference_ranks(metrics_df, town), town
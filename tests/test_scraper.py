@@ -0,0 +1,129 @@
+"""Incremental scrape against the local fixture server: conditional requests, state file and CSV upsert"""
+
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from bays_scraper import SEASON_KEYS, main, parse_standings, scrape_incremental, state_key, update_csv
+from conftest import ROOT
+from data_store import TEAMS_CSV
+from fixture_server import FIXTURES_DIR, fixture_path, saved_targets, start_fixture_server
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    """A writable copy of the saved pages"""
+    return shutil.copytree(FIXTURES_DIR, tmp_path / 'standings')
+
+
+@pytest.fixture
+def base_url(fixtures_dir):
+    server, url = start_fixture_server(fixtures_dir=str(fixtures_dir))
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / os.path.basename(TEAMS_CSV)
+    shutil.copyfile(os.path.join(ROOT, TEAMS_CSV), path)
+    return str(path)
+
+
+def season_lines(csv_path, target):
+    """The CSV's data lines, and for each whether it belongs to the target season"""
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        lines = f.read().splitlines()
+    teams_df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    assert len(teams_df) == len(lines) - 1
+    in_season = [tuple(key) == tuple(str(part) for part in target)
+                 for key in teams_df[SEASON_KEYS].itertuples(index=False)]
+    return lines, in_season
+
+
+def rename_first_team(fixtures_dir, target):
+    """Edit one saved page; returns the page's rows as the scraper will parse them"""
+    path = fixture_path(*target, fixtures_dir=str(fixtures_dir))
+    with open(path, encoding='utf-8') as f:
+        page = f.read()
+    name = parse_standings(page, *target, '')[0]['team_name']
+    page = page.replace(f'<td>{name}</td>', f'<td>{name} Renamed</td>', 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return parse_standings(page, *target, '')
+
+
+def test_incremental_refresh_upserts_only_changed_season(fixtures_dir, base_url, csv_path):
+    targets = saved_targets(str(fixtures_dir))
+
+    teams_df, changed, state, stats = scrape_incremental(targets, base_url, {})
+    assert (stats['changed'], stats['failed']) == (len(targets), 0)
+    assert set(state) == {state_key(target) for target in targets}
+    update_csv(csv_path, teams_df, changed)
+
+    # Nothing changed: every page answers 304 and the CSV is not touched
+    teams_df, changed, unchanged_state, stats = scrape_incremental(targets, base_url, state)
+    assert (stats['changed'], stats['unchanged'], stats['failed']) == (0, len(targets), 0)
+    assert changed == [] and teams_df.empty
+    assert unchanged_state == state
+
+    target = ('FOX', 2024, 'Fall')
+    before, before_in_season = season_lines(csv_path, target)
+    expected = rename_first_team(fixtures_dir, target)
+
+    teams_df, changed, state, stats = scrape_incremental(targets, base_url, state)
+    assert changed == [target]
+    assert (stats['changed'], stats['unchanged']) == (1, len(targets) - 1)
+    update_csv(csv_path, teams_df, changed)
+    after, after_in_season = season_lines(csv_path, target)
+
+    # Every other line is byte-for-byte the same and in the same order
+    assert [line for line, flag in zip(before[1:], before_in_season) if not flag] == \
+           [line for line, flag in zip(after[1:], after_in_season) if not flag]
+    assert before[0] == after[0]
+    # The season's rows are the edited page's, at the position the old rows held
+    assert after_in_season.index(True) == before_in_season.index(True)
+    season_df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)[after_in_season]
+    assert list(season_df['team_name']) == [row['team_name'] for row in expected]
+
+
+def test_same_content_without_validators_is_unchanged(base_url, fixtures_dir):
+    targets = saved_targets(str(fixtures_dir))[:4]
+    _, _, state, _ = scrape_incremental(targets, base_url, {})
+
+    # Without ETag/Last-Modified the server sends the page again; the content hash catches it
+    stripped = {key: {**entry, 'etag': None, 'last_modified': None} for key, entry in state.items()}
+    teams_df, changed, new_state, stats = scrape_incremental(targets, base_url, stripped)
+    assert (stats['changed'], stats['unchanged']) == (0, len(targets))
+    assert changed == [] and teams_df.empty
+    assert new_state == state
+
+
+def test_full_update_keeps_other_pages_state(fixtures_dir, csv_path, tmp_path):
+    state_path = str(tmp_path / 'scrape_state.json')
+    common = ['--fixtures', '--fixtures-dir', str(fixtures_dir), '--state', state_path]
+    assert main(common + ['--incremental', '--update', csv_path]) == 0
+    with open(state_path, encoding='utf-8') as f:
+        state = json.load(f)
+
+    assert main(common + ['--towns', 'FOX', '--update', csv_path]) == 0
+    with open(state_path, encoding='utf-8') as f:
+        assert json.load(f) == state
+
+
+def test_incremental_output_persists_state(fixtures_dir, tmp_path):
+    state_path = str(tmp_path / 'scrape_state.json')
+    output = str(tmp_path / 'new_rows.csv')
+    args = ['--fixtures', '--fixtures-dir', str(fixtures_dir), '--state', state_path, '--incremental',
+            '--output', output]
+
+    assert main(args) == 0
+    assert len(pd.read_csv(output)) > 0
+    with open(state_path, encoding='utf-8') as f:
+        assert set(json.load(f)) == {state_key(target) for target in saved_targets(str(fixtures_dir))}
+
+    assert main(args) == 0
+    assert pd.read_csv(output).empty
@@ -0,0 +1,69 @@
+"""Snapshot: serves the live numbers while its sources are unchanged, nothing once they change"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from analytics import TOWN_NAMES, build_cube, build_time_series_by_town, metrics_from_cube, select_cube
+from conftest import ROOT
+from data_store import ENROLLMENT_CSV, TEAMS_CSV
+from snapshot import SNAPSHOT_PERIODS, Snapshot, build_snapshot, load_snapshot, write_snapshot
+
+YEAR_RANGE = (2023, 2025)
+TOWNS = tuple(TOWN_NAMES)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    teams_csv = str(tmp_path / os.path.basename(TEAMS_CSV))
+    enrollment_csv = str(tmp_path / os.path.basename(ENROLLMENT_CSV))
+    shutil.copyfile(os.path.join(ROOT, TEAMS_CSV), teams_csv)
+    shutil.copyfile(os.path.join(ROOT, ENROLLMENT_CSV), enrollment_csv)
+    return teams_csv, enrollment_csv
+
+
+@pytest.fixture
+def snapshot(sources):
+    teams_csv, enrollment_csv = sources
+    return Snapshot(build_snapshot(teams_csv, enrollment_csv))
+
+
+def test_current_snapshot_matches_live_metrics(snapshot, teams_df, enrollment_map, towns):
+    cube_slice = select_cube(build_cube(teams_df), range(YEAR_RANGE[0], YEAR_RANGE[1] + 1), SNAPSHOT_PERIODS)
+    expected = metrics_from_cube(cube_slice, towns, enrollment_map, TOWN_NAMES)
+    pd.testing.assert_frame_equal(snapshot.metrics(YEAR_RANGE, SNAPSHOT_PERIODS, TOWNS), expected,
+                                  check_exact=True)
+    assert snapshot.time_series(YEAR_RANGE, SNAPSHOT_PERIODS, TOWNS) == \
+           build_time_series_by_town(cube_slice, towns, enrollment_map)
+
+
+def test_touched_source_still_served(snapshot, sources):
+    teams_csv, _ = sources
+    stat = os.stat(teams_csv)
+    os.utime(teams_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert snapshot.metrics(YEAR_RANGE, SNAPSHOT_PERIODS, TOWNS) is not None
+
+
+@pytest.mark.parametrize('changed', [0, 1])
+def test_changed_source_disables_snapshot(snapshot, sources, changed):
+    path = sources[changed]
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines(keepends=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:-1])
+
+    assert snapshot.metrics(YEAR_RANGE, SNAPSHOT_PERIODS, TOWNS) is None
+    assert snapshot.time_series(YEAR_RANGE, SNAPSHOT_PERIODS, TOWNS) is None
+
+
+def test_load_snapshot_rejects_stale_file(sources, tmp_path):
+    teams_csv, enrollment_csv = sources
+    path = str(tmp_path / 'metrics_snapshot.json.gz')
+    write_snapshot(build_snapshot(teams_csv, enrollment_csv), path)
+    assert load_snapshot(path) is not None
+
+    with open(teams_csv, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert load_snapshot(path) is None